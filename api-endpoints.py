@@ -221,10 +221,12 @@ from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, undefer
 
 from sangram_tutor.db.session import get_db
 from sangram_tutor.models.user import User
+from sangram_tutor.models.cache import get_content as get_cached_content, get_topic
 from sangram_tutor.models.curriculum import CurriculumContent, CurriculumTopic
 from sangram_tutor.models.progress import Progress, CompletionStatus
 from sangram_tutor.utils.auth import get_current_active_user
@@ -324,7 +326,7 @@ async def get_topic_content(
         topic_id: ID of the topic to get content for
     """
     # Check if topic exists
-    topic = db.query(CurriculumTopic).filter_by(id=topic_id).first()
+    topic = get_topic(db, topic_id)
     if not topic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -332,12 +334,12 @@ async def get_topic_content(
         )
     
     # Get all content for the topic
-    content_items = db.query(CurriculumContent).filter_by(topic_id=topic_id).all()
-    
-    # Convert content_data JSON string to dict for each item
-    import json
-    for item in content_items:
-        item.content_data = json.loads(item.content_data)
+    content_items = (
+        db.query(CurriculumContent)
+        .options(undefer(CurriculumContent.content_data))
+        .filter_by(topic_id=topic_id)
+        .all()
+    )
     
     return content_items
 
@@ -354,20 +356,31 @@ async def get_content(
     Args:
         content_id: ID of the content to get
     """
-    content = db.query(CurriculumContent).filter_by(id=content_id).first()
+    content = get_cached_content(db, content_id)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Content with ID {content_id} not found"
         )
     
-    # Convert content_data JSON string to dict
-    import json
-    content.content_data = json.loads(content.content_data)
-    
     return content
 
 
+def _progress_lookup(user_id: int, content_id: int):
+    """
+    Build the (user_id, content_id) progress lookup as a lambda statement.
+    
+    The SQL is compiled once and cached; later calls only rebind the
+    closure values as parameters.
+    """
+    return lambda_stmt(
+        lambda: select(Progress).where(
+            Progress.user_id == user_id,
+            Progress.content_id == content_id
+        )
+    )
+
+
 @router.post("/content/{content_id}/progress", response_model=ProgressResponse)
 async def update_progress(
     content_id: int,
@@ -383,7 +396,7 @@ async def update_progress(
         progress_data: Progress update data
     """
     # Check if content exists
-    content = db.query(CurriculumContent).filter_by(id=content_id).first()
+    content = get_cached_content(db, content_id)
     if not content:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -391,10 +404,9 @@ async def update_progress(
         )
     
     # Get existing progress or create new
-    progress = db.query(Progress).filter_by(
-        user_id=current_user.id,
-        content_id=content_id
-    ).first()
+    progress = db.execute(
+        _progress_lookup(current_user.id, content_id)
+    ).scalars().first()
     
     from datetime import datetime
     
@@ -419,8 +431,7 @@ async def update_progress(
             progress.engagement_score = progress_data.engagement_score
         
         if progress_data.mistakes_data is not None:
-            import json
-            progress.mistakes_data = json.dumps(progress_data.mistakes_data)
+            progress.mistakes_data = progress_data.mistakes_data
         
         if progress_data.notes is not None:
             progress.notes = progress_data.notes
@@ -444,9 +455,6 @@ async def update_progress(
                 detail=f"Invalid status: {progress_data.status}"
             )
         
-        import json
-        mistakes_json = json.dumps(progress_data.mistakes_data) if progress_data.mistakes_data else None
-        
         # Set completion timestamp if applicable
         completed_at = None
         if progress_data.status in ["completed", "mastered"]:
@@ -462,7 +470,7 @@ async def update_progress(
             last_interaction=datetime.utcnow(),
             completed_at=completed_at,
             engagement_score=progress_data.engagement_score,
-            mistakes_data=mistakes_json,
+            mistakes_data=progress_data.mistakes_data or None,
             notes=progress_data.notes
         )
         db.add(progress)
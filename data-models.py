@@ -2,27 +2,66 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Integer
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import JSON, SmallInteger, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
+
+
+class Base(DeclarativeBase):
+    """Declarative base shared by all models."""
+
+
+# Native JSON column type: binary JSONB on PostgreSQL, generic JSON elsewhere
+JSONType = JSON().with_variant(JSONB, "postgresql")
+
+
+class IntEnumType(TypeDecorator):
+    """
+    Store a Python enum as a SMALLINT code instead of its string label.
+    
+    Codes follow member declaration order starting at 1, so new members
+    must be appended to the end of the enum. Bound values may be enum
+    members or their string values; results come back as enum members.
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._members = tuple(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members, start=1)}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value - 1]
 
-Base = declarative_base()
 
 class BaseModel(Base):
     """Base model for all database models with common fields."""
     __abstract__ = True
     
-    id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
 
 # sangram_tutor/models/user.py
+from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, Enum as SQLAEnum, ForeignKey, Integer, String, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Enum as SQLAEnum, ForeignKey, Integer, String, Table
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from sangram_tutor.models.achievements import user_achievements
 from sangram_tutor.models.base import BaseModel, Base
 
 
@@ -56,20 +95,20 @@ class User(BaseModel):
     """User model representing students, parents, and teachers."""
     __tablename__ = "users"
     
-    username = Column(String(50), unique=True, index=True, nullable=False)
-    email = Column(String(100), unique=True, index=True, nullable=True)
-    hashed_password = Column(String(255), nullable=False)
-    role = Column(SQLAEnum(UserRole), nullable=False, default=UserRole.STUDENT)
+    username: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True)
+    hashed_password: Mapped[str] = mapped_column(String(255))
+    role: Mapped[UserRole] = mapped_column(SQLAEnum(UserRole), default=UserRole.STUDENT)
     
     # Profile information
-    full_name = Column(String(100), nullable=True)
-    avatar = Column(String(255), nullable=True)
-    grade_level = Column(Integer, nullable=True)
-    birth_date = Column(DateTime, nullable=True)
+    full_name: Mapped[Optional[str]] = mapped_column(String(100))
+    avatar: Mapped[Optional[str]] = mapped_column(String(255))
+    grade_level: Mapped[Optional[int]]
+    birth_date: Mapped[Optional[datetime]]
     
     # Settings
-    is_active = Column(Boolean, default=True)
-    language_preference = Column(String(10), default="en")
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    language_preference: Mapped[Optional[str]] = mapped_column(String(10), default="en")
     
     # Relationships
     learning_styles = relationship(
@@ -77,20 +116,24 @@ class User(BaseModel):
         secondary=user_learning_styles,
         backref="users"
     )
-    progress = relationship("Progress", back_populates="user")
-    parent_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    children = relationship("User", backref="parent", remote_side=[id])
+    progress: Mapped[List["Progress"]] = relationship(back_populates="user")
+    achievements: Mapped[List["Achievement"]] = relationship(
+        secondary=user_achievements,
+        back_populates="users"
+    )
+    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"))
+    parent: Mapped[Optional["User"]] = relationship(back_populates="children", remote_side="User.id")
+    children: Mapped[List["User"]] = relationship(back_populates="parent")
 
 
 # sangram_tutor/models/curriculum.py
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from sqlalchemy import (Column, Enum as SQLAEnum, Float, ForeignKey, Integer, 
-                       String, Table, Text)
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, String, Table, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from sangram_tutor.models.base import BaseModel, Base
+from sangram_tutor.models.base import BaseModel, Base, IntEnumType, JSONType
 
 
 class Subject(str, Enum):
@@ -130,53 +173,60 @@ class CurriculumTopic(BaseModel):
     """Model representing a curriculum topic based on NCERT syllabus."""
     __tablename__ = "curriculum_topics"
     
-    name = Column(String(100), nullable=False)
-    description = Column(Text, nullable=True)
-    subject = Column(SQLAEnum(Subject), nullable=False, default=Subject.MATHEMATICS)
-    grade_level = Column(Integer, nullable=False)
-    standard_code = Column(String(50), nullable=True)  # NCERT standard code
+    name: Mapped[str] = mapped_column(String(100))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    subject: Mapped[Subject] = mapped_column(IntEnumType(Subject), default=Subject.MATHEMATICS, index=True)
+    grade_level: Mapped[int]
+    standard_code: Mapped[Optional[str]] = mapped_column(String(50))  # NCERT standard code
     
     # Relationships
-    contents = relationship("CurriculumContent", back_populates="topic")
+    contents: Mapped[List["CurriculumContent"]] = relationship(back_populates="topic", lazy="selectin")
 
 
 class CurriculumContent(BaseModel):
     """Model representing specific content items within a topic."""
     __tablename__ = "curriculum_content"
     
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    content_data = Column(Text, nullable=False)  # JSON content data
-    content_type = Column(SQLAEnum(ContentType), nullable=False)
-    difficulty_level = Column(SQLAEnum(DifficultyLevel), nullable=False)
-    estimated_time_minutes = Column(Integer, default=10)
-    points_reward = Column(Integer, default=10)
+    title: Mapped[str] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    # Loaded on access; listing endpoints that return it undefer it
+    content_data: Mapped[Any] = mapped_column(JSONType, deferred=True, deferred_group="blob")
+    content_type: Mapped[ContentType] = mapped_column(IntEnumType(ContentType))
+    difficulty_level: Mapped[DifficultyLevel] = mapped_column(IntEnumType(DifficultyLevel))
+    estimated_time_minutes: Mapped[Optional[int]] = mapped_column(default=10)
+    points_reward: Mapped[Optional[int]] = mapped_column(default=10)
     
     # Foreign Keys
-    topic_id = Column(Integer, ForeignKey("curriculum_topics.id"), nullable=False)
+    topic_id: Mapped[int] = mapped_column(ForeignKey("curriculum_topics.id"))
     
     # Relationships
-    topic = relationship("CurriculumTopic", back_populates="contents")
-    prerequisites = relationship(
-        "CurriculumContent",
+    topic: Mapped["CurriculumTopic"] = relationship(back_populates="contents")
+    prerequisites: Mapped[List["CurriculumContent"]] = relationship(
+        secondary=content_prerequisites,
+        primaryjoin="CurriculumContent.id == content_prerequisites.c.content_id",
+        secondaryjoin="CurriculumContent.id == content_prerequisites.c.prerequisite_id",
+        back_populates="dependent_contents",
+        lazy="selectin"
+    )
+    dependent_contents: Mapped[List["CurriculumContent"]] = relationship(
         secondary=content_prerequisites,
-        primaryjoin=(content_prerequisites.c.content_id == id),
-        secondaryjoin=(content_prerequisites.c.prerequisite_id == id),
-        backref="dependent_contents"
+        primaryjoin="CurriculumContent.id == content_prerequisites.c.prerequisite_id",
+        secondaryjoin="CurriculumContent.id == content_prerequisites.c.content_id",
+        back_populates="prerequisites",
+        lazy="raise"
     )
-    progress = relationship("Progress", back_populates="content")
+    progress: Mapped[List["Progress"]] = relationship(back_populates="content", lazy="raise")
 
 
 # sangram_tutor/models/progress.py
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import (Column, DateTime, Enum as SQLAEnum, Float, ForeignKey, 
-                       Integer, String, Boolean, Text)
-from sqlalchemy.orm import relationship
+from sqlalchemy import Enum as SQLAEnum, ForeignKey, Index, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from sangram_tutor.models.base import BaseModel
+from sangram_tutor.models.base import BaseModel, JSONType
 
 
 class CompletionStatus(str, Enum):
@@ -189,38 +239,50 @@ class CompletionStatus(str, Enum):
 class Progress(BaseModel):
     """Model tracking student progress on curriculum content."""
     __tablename__ = "progress"
+    __table_args__ = (
+        # One progress row per (user, content); also serves user_id-only lookups
+        Index("ix_progress_user_content", "user_id", "content_id", unique=True),
+        # Recent-activity scans ordered by last_interaction
+        Index("ix_progress_user_lastinteraction", "user_id", "last_interaction"),
+        # Containment queries on mistake patterns (mistakes_data @> ...)
+        Index("ix_progress_mistakes_gin", "mistakes_data", postgresql_using="gin")
+        .ddl_if(dialect="postgresql"),
+    )
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    content_id = Column(Integer, ForeignKey("curriculum_content.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    content_id: Mapped[int] = mapped_column(ForeignKey("curriculum_content.id"))
     
     # Progress data
-    status = Column(SQLAEnum(CompletionStatus), default=CompletionStatus.NOT_STARTED)
-    score = Column(Float, nullable=True)
-    attempts = Column(Integer, default=0)
-    time_spent_seconds = Column(Integer, default=0)
-    last_interaction = Column(DateTime, default=datetime.utcnow)
-    completed_at = Column(DateTime, nullable=True)
+    status: Mapped[Optional[CompletionStatus]] = mapped_column(
+        SQLAEnum(CompletionStatus), default=CompletionStatus.NOT_STARTED
+    )
+    score: Mapped[Optional[float]]
+    attempts: Mapped[Optional[int]] = mapped_column(default=0)
+    time_spent_seconds: Mapped[Optional[int]] = mapped_column(default=0)
+    last_interaction: Mapped[Optional[datetime]] = mapped_column(server_default=func.now())
+    completed_at: Mapped[Optional[datetime]]
     
     # Learning data
-    confidence_level = Column(Float, nullable=True)  # AI-assessed confidence (0-1)
-    mistakes_data = Column(Text, nullable=True)  # JSON data about patterns of mistakes
-    engagement_score = Column(Float, nullable=True)  # Measure of user engagement (0-1)
-    notes = Column(Text, nullable=True)
+    confidence_level: Mapped[Optional[float]]  # AI-assessed confidence (0-1)
+    mistakes_data: Mapped[Optional[Any]] = mapped_column(
+        JSONType, deferred=True, deferred_group="blob"
+    )  # Patterns of mistakes
+    engagement_score: Mapped[Optional[float]]  # Measure of user engagement (0-1)
+    notes: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="blob")
     
     # Relationships
-    user = relationship("User", back_populates="progress")
-    content = relationship("CurriculumContent", back_populates="progress")
+    user: Mapped["User"] = relationship(back_populates="progress")
+    content: Mapped["CurriculumContent"] = relationship(back_populates="progress")
 
 
 # sangram_tutor/models/achievements.py
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import (Column, Enum as SQLAEnum, ForeignKey, Integer, 
-                       String, Table, Text, DateTime)
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from sangram_tutor.models.base import BaseModel, Base
+from sangram_tutor.models.base import BaseModel, Base, IntEnumType
 
 
 class AchievementType(str, Enum):
@@ -247,16 +309,122 @@ class Achievement(BaseModel):
     """Model for defining achievements that students can earn."""
     __tablename__ = "achievements"
     
-    name = Column(String(100), nullable=False)
-    description = Column(Text, nullable=False)
-    achievement_type = Column(SQLAEnum(AchievementType), nullable=False)
-    icon_url = Column(String(255), nullable=True)
-    points_value = Column(Integer, default=10)
-    requirement_data = Column(Text, nullable=False)  # JSON with requirements
+    name: Mapped[str] = mapped_column(String(100))
+    description: Mapped[str] = mapped_column(Text)
+    achievement_type: Mapped[AchievementType] = mapped_column(IntEnumType(AchievementType))
+    icon_url: Mapped[Optional[str]] = mapped_column(String(255))
+    points_value: Mapped[Optional[int]] = mapped_column(default=10)
+    requirement_data: Mapped[str] = mapped_column(Text)  # JSON with requirements
     
     # Relationships through association table
-    users = relationship(
-        "User",
+    users: Mapped[List["User"]] = relationship(
         secondary=user_achievements,
-        backref="achievements"
+        back_populates="achievements",
+        lazy="raise"
+    )
+
+
+# sangram_tutor/models/loaders.py
+from typing import Tuple
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from sangram_tutor.models.curriculum import CurriculumContent
+from sangram_tutor.models.progress import Progress
+
+# Loader option sets for common relationship traversals. Pass them as
+# query.options(*progress_with_content()) so walking the relationship costs
+# a fixed number of queries instead of one lazy load per row. They are built
+# per query, since building them configures every mapper, which must not
+# happen while the model modules are still being imported.
+
+
+def progress_with_content() -> Tuple:
+    """Options for progress rows whose content is read per row."""
+    return (joinedload(Progress.content),)
+
+
+def content_with_prerequisites() -> Tuple:
+    """Options for content that is checked against its prerequisites."""
+    return (selectinload(CurriculumContent.prerequisites),)
+
+
+# sangram_tutor/models/cache.py
+import copy
+from typing import Dict, Optional, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, undefer
+
+from sangram_tutor.models.achievements import Achievement
+from sangram_tutor.models.base import BaseModel
+from sangram_tutor.models.curriculum import CurriculumContent, CurriculumTopic
+from sangram_tutor.utils.cache import TTLCache
+
+# Read-mostly reference rows, cached per process as column snapshots keyed
+# by (model, id). Entries are dropped when this process updates or deletes
+# the row. Nothing tells other processes, so the TTL is kept short: their
+# changes show up here within a minute.
+_reference_cache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _snapshot(obj: BaseModel) -> Dict:
+    """
+    Copy the column values of a loaded instance.
+    
+    JSON values are deep-copied so later in-place edits to the instance
+    never reach the cache.
+    """
+    return copy.deepcopy(
+        {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
     )
+
+
+def _get_cached(db: Session, model: Type[BaseModel], obj_id: int) -> Optional[BaseModel]:
+    """
+    Fetch a row by primary key, serving repeat lookups from the cache.
+    
+    An instance already in the session is returned as is, so its pending
+    changes are kept. Otherwise cache hits are rebuilt as detached
+    instances, each with its own copy of the cached values, and merged
+    into the session without a SELECT.
+    """
+    obj = db.identity_map.get(db.identity_key(model, obj_id))
+    if obj is not None:
+        return obj
+    
+    key = (model, obj_id)
+    values = _reference_cache.get(key)
+    if values is not None:
+        obj = model(**copy.deepcopy(values))
+        make_transient_to_detached(obj)
+        return db.merge(obj, load=False)
+    
+    obj = db.get(model, obj_id, options=[undefer("*")])
+    if obj is not None:
+        _reference_cache.set(key, _snapshot(obj))
+    return obj
+
+
+def get_content(db: Session, content_id: int) -> Optional[CurriculumContent]:
+    """Get a curriculum content item by ID."""
+    return _get_cached(db, CurriculumContent, content_id)
+
+
+def get_topic(db: Session, topic_id: int) -> Optional[CurriculumTopic]:
+    """Get a curriculum topic by ID."""
+    return _get_cached(db, CurriculumTopic, topic_id)
+
+
+def get_achievement(db: Session, achievement_id: int) -> Optional[Achievement]:
+    """Get an achievement by ID."""
+    return _get_cached(db, Achievement, achievement_id)
+
+
+def _invalidate(mapper, connection, target) -> None:
+    _reference_cache.pop((mapper.class_, target.id))
+
+
+for _model in (CurriculumContent, CurriculumTopic, Achievement):
+    event.listen(_model, "after_update", _invalidate)
+    event.listen(_model, "after_delete", _invalidate)
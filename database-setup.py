@@ -13,6 +13,7 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sangram_tutor.db")
 engine = create_engine(
     DATABASE_URL, 
     echo=True,  # Set to False in production
+    query_cache_size=1200,  # Room for the many parametrised ORM/lambda statements
     connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 )
 
@@ -139,7 +140,7 @@ def init_db(db: Session) -> None:
             topic_id=topics[0].id,
             title="Introduction to Shapes",
             description="Learn about basic shapes like circle, square, triangle.",
-            content_data='{"type": "concept", "elements": [{"type": "text", "content": "Shapes are all around us!"}, {"type": "image", "url": "circle.png"}, {"type": "image", "url": "square.png"}, {"type": "image", "url": "triangle.png"}]}',
+            content_data={"type": "concept", "elements": [{"type": "text", "content": "Shapes are all around us!"}, {"type": "image", "url": "circle.png"}, {"type": "image", "url": "square.png"}, {"type": "image", "url": "triangle.png"}]},
             content_type=ContentType.CONCEPT,
             difficulty_level=DifficultyLevel.BEGINNER,
             estimated_time_minutes=5,
@@ -148,7 +149,7 @@ def init_db(db: Session) -> None:
             topic_id=topics[0].id,
             title="Shape Recognition Game",
             description="Fun game to practice recognizing different shapes.",
-            content_data='{"type": "game", "game_type": "matching", "items": [{"question": "circle.png", "answer": "Circle"}, {"question": "square.png", "answer": "Square"}, {"question": "triangle.png", "answer": "Triangle"}]}',
+            content_data={"type": "game", "game_type": "matching", "items": [{"question": "circle.png", "answer": "Circle"}, {"question": "square.png", "answer": "Square"}, {"question": "triangle.png", "answer": "Triangle"}]},
             content_type=ContentType.GAME,
             difficulty_level=DifficultyLevel.EASY,
             estimated_time_minutes=10,
@@ -162,7 +163,7 @@ def init_db(db: Session) -> None:
             topic_id=topics[1].id,
             title="Counting from 1 to 5",
             description="Learn to count objects from 1 to 5.",
-            content_data='{"type": "concept", "elements": [{"type": "text", "content": "Let\'s count together!"}, {"type": "interactive", "counts": [1, 2, 3, 4, 5], "objects": ["apple", "ball", "cat", "dog", "elephant"]}]}',
+            content_data={"type": "concept", "elements": [{"type": "text", "content": "Let's count together!"}, {"type": "interactive", "counts": [1, 2, 3, 4, 5], "objects": ["apple", "ball", "cat", "dog", "elephant"]}]},
             content_type=ContentType.CONCEPT,
             difficulty_level=DifficultyLevel.BEGINNER,
             estimated_time_minutes=8,
@@ -171,7 +172,7 @@ def init_db(db: Session) -> None:
             topic_id=topics[1].id,
             title="Writing Numbers Quiz",
             description="Practice writing numbers from 1 to 5.",
-            content_data='{"type": "quiz", "questions": [{"prompt": "Write the number:", "image": "one_finger.png", "answer": "1"}, {"prompt": "Write the number:", "image": "two_fingers.png", "answer": "2"}]}',
+            content_data={"type": "quiz", "questions": [{"prompt": "Write the number:", "image": "one_finger.png", "answer": "1"}, {"prompt": "Write the number:", "image": "two_fingers.png", "answer": "2"}]},
             content_type=ContentType.QUIZ,
             difficulty_level=DifficultyLevel.EASY,
             estimated_time_minutes=12,
@@ -185,7 +186,7 @@ def init_db(db: Session) -> None:
             topic_id=topics[2].id,
             title="Adding with Pictures",
             description="Learn addition using visual representations.",
-            content_data='{"type": "concept", "elements": [{"type": "text", "content": "Addition means combining things together!"}, {"type": "interactive", "left": 2, "right": 3, "result": 5}]}',
+            content_data={"type": "concept", "elements": [{"type": "text", "content": "Addition means combining things together!"}, {"type": "interactive", "left": 2, "right": 3, "result": 5}]},
             content_type=ContentType.CONCEPT,
             difficulty_level=DifficultyLevel.EASY,
             estimated_time_minutes=10,
@@ -194,7 +195,7 @@ def init_db(db: Session) -> None:
             topic_id=topics[2].id,
             title="Addition Practice",
             description="Solve simple addition problems.",
-            content_data='{"type": "exercise", "problems": [{"prompt": "1 + 2 = ?", "answer": 3}, {"prompt": "3 + 1 = ?", "answer": 4}, {"prompt": "2 + 2 = ?", "answer": 4}]}',
+            content_data={"type": "exercise", "problems": [{"prompt": "1 + 2 = ?", "answer": 3}, {"prompt": "3 + 1 = ?", "answer": 4}, {"prompt": "2 + 2 = ?", "answer": 4}]},
             content_type=ContentType.EXERCISE,
             difficulty_level=DifficultyLevel.MEDIUM,
             estimated_time_minutes=15,
@@ -224,7 +225,7 @@ import faiss
 import os
 from pathlib import Path
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from sangram_tutor.models.curriculum import CurriculumContent
 
@@ -270,7 +271,7 @@ def update_content_embeddings(db: Session) -> None:
     index = faiss.read_index(str(index_path))
     
     # Get all content items
-    contents = db.query(CurriculumContent).all()
+    contents = db.query(CurriculumContent).options(undefer(CurriculumContent.content_data)).all()
     
     if not contents:
         logger.warning("No content found in database to embed")
@@ -282,9 +283,9 @@ def update_content_embeddings(db: Session) -> None:
     content_ids = []
     
     for content in contents:
-        # Parse content data to extract text
+        # Content data is already a parsed structure (JSON column)
         try:
-            content_data = json.loads(content.content_data)
+            content_data = content.content_data
             # In a real implementation, we would extract text from content_data
             # and use a model to generate an embedding
 
@@ -1,19 +1,23 @@
 # sangram_tutor/ml/learning_path.py
-import json
 import logging
 import math
-import random
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
 
 import numpy as np
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from sangram_tutor.models.curriculum import (
     CurriculumContent, ContentType, DifficultyLevel
 )
+from sangram_tutor.models.loaders import content_with_prerequisites, progress_with_content
 from sangram_tutor.models.progress import Progress, CompletionStatus
 from sangram_tutor.models.user import User, LearningStyle
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; scoring falls back to NumPy
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 # Difficulty level progression mapping
@@ -87,14 +91,126 @@ LEARNING_STYLE_WEIGHTS = {
     },
 }
 
+# Integer codes for scoring candidates as arrays
+CONTENT_TYPES = list(ContentType)
+CONTENT_TYPE_INDEX = {content_type: i for i, content_type in enumerate(CONTENT_TYPES)}
+DIFFICULTY_INDEX = {level: i for i, level in enumerate(DifficultyLevel)}
+STYLE_INDEX = {style: i for i, style in enumerate(LearningStyle)}
+
+# LEARNING_STYLE_WEIGHTS as a (style, content type) table; unlisted pairs weigh 0.7
+STYLE_WEIGHT_TABLE = np.array([
+    [LEARNING_STYLE_WEIGHTS.get(style, {}).get(content_type, 0.7) for content_type in CONTENT_TYPES]
+    for style in LearningStyle
+])
+
+# Difficulty appropriateness (0-1) by topic performance band (rows) and
+# difficulty level (columns: beginner, easy, medium, hard, expert)
+DIFFICULTY_SCORE_TABLE = np.array([
+    [0.7, 0.9, 0.9, 0.7, 0.7],  # No data for this topic, prefer middle difficulty
+    [0.8, 0.8, 0.8, 0.8, 0.8],  # No scores yet
+    [0.6, 0.6, 0.6, 1.0, 1.0],  # Excellent performance (avg > 90)
+    [0.5, 0.5, 1.0, 0.8, 0.5],  # Good performance (avg > 75)
+    [0.4, 0.9, 0.9, 0.4, 0.4],  # Average performance (avg > 60)
+    [1.0, 0.8, 0.3, 0.3, 0.3],  # Struggling
+])
+
+
+def _score_kernel(
+    topic_idx: np.ndarray,
+    ctype_ids: np.ndarray,
+    diff_levels: np.ndarray,
+    avg_topic_scores: np.ndarray,
+    style_weight_table: np.ndarray,
+    style_idx: np.ndarray,
+    difficulty_table: np.ndarray
+) -> np.ndarray:
+    """
+    Score candidate content items one at a time.
+    
+    Args:
+        topic_idx: Per-candidate index into avg_topic_scores, -1 if the user
+            has no activity in the candidate's topic
+        ctype_ids: Per-candidate content type codes
+        diff_levels: Per-candidate difficulty level codes
+        avg_topic_scores: User's average score per topic, -1 if unscored
+        style_weight_table: Weight per (learning style, content type)
+        style_idx: Codes of the user's learning styles
+        difficulty_table: Difficulty score per (performance band, difficulty)
+        
+    Returns:
+        Score per candidate, before random jitter
+    """
+    scores = np.empty(topic_idx.shape[0])
+    for i in range(topic_idx.shape[0]):
+        # Factor 1: Content type suitability for learning style
+        style_score = 0.0
+        for style in style_idx:
+            style_score += style_weight_table[style, ctype_ids[i]]
+        style_score /= style_idx.shape[0]
+        
+        # Factor 2: Appropriate difficulty level for the user's topic performance
+        if topic_idx[i] < 0:
+            band = 0
+        else:
+            avg_score = avg_topic_scores[topic_idx[i]]
+            if avg_score < 0:
+                band = 1
+            elif avg_score > 90:
+                band = 2
+            elif avg_score > 75:
+                band = 3
+            elif avg_score > 60:
+                band = 4
+            else:
+                band = 5
+        difficulty_score = difficulty_table[band, diff_levels[i]]
+        
+        # Factor 3: Topic relevance is a placeholder weight of 1.0
+        scores[i] = style_score * 0.4 + difficulty_score * 0.4 + 1.0 * 0.1
+    return scores
+
+
+def _score_vectorized(
+    topic_idx: np.ndarray,
+    ctype_ids: np.ndarray,
+    diff_levels: np.ndarray,
+    avg_topic_scores: np.ndarray,
+    style_weight_table: np.ndarray,
+    style_idx: np.ndarray,
+    difficulty_table: np.ndarray
+) -> np.ndarray:
+    """NumPy equivalent of _score_kernel for deployments without Numba."""
+    style_scores = style_weight_table[style_idx][:, ctype_ids].mean(axis=0)
+    
+    bands = np.zeros(topic_idx.shape[0], dtype=np.int64)
+    has_topic = topic_idx >= 0
+    avg_scores = avg_topic_scores[topic_idx[has_topic]]
+    bands[has_topic] = np.select(
+        [avg_scores < 0, avg_scores > 90, avg_scores > 75, avg_scores > 60],
+        [1, 2, 3, 4],
+        default=5
+    )
+    difficulty_scores = difficulty_table[bands, diff_levels]
+    
+    return style_scores * 0.4 + difficulty_scores * 0.4 + 1.0 * 0.1
+
+
+# Compiled once and cached on disk across processes when Numba is installed
+if njit is not None:
+    _score_candidates = njit(cache=True, fastmath=True)(_score_kernel)
+else:
+    _score_candidates = _score_vectorized
+
 class LearningPathGenerator:
     """
     Generates personalized learning paths for students based on their
     progress, learning style, and curriculum requirements.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, seed: Optional[int] = None):
         self.db = db
+        # Generator for score jitter; pass a seed for reproducible rankings
+        self._rng = np.random.default_rng(seed)
     
     def get_next_content(self, user_id: int, topic_id: Optional[int] = None) -> Optional[Dict]:
         """
@@ -114,11 +230,16 @@ class LearningPathGenerator:
             return None
         
         # Get user's progress data
-        progress_records = self.db.query(Progress).filter(Progress.user_id == user_id).all()
-        completed_content_ids = [
+        progress_records = (
+            self.db.query(Progress)
+            .options(*progress_with_content())
+            .filter(Progress.user_id == user_id)
+            .all()
+        )
+        completed_content_ids = {
             p.content_id for p in progress_records 
             if p.status in (CompletionStatus.COMPLETED, CompletionStatus.MASTERED)
-        ]
+        }
         
         in_progress_content_ids = [
             p.content_id for p in progress_records 
@@ -127,14 +248,17 @@ class LearningPathGenerator:
         
         # Try to find in-progress content first
         if in_progress_content_ids:
-            content = self.db.query(CurriculumContent).filter(
-                CurriculumContent.id.in_(in_progress_content_ids)
-            ).first()
+            content = (
+                self.db.query(CurriculumContent)
+                .options(undefer(CurriculumContent.content_data))
+                .filter(CurriculumContent.id.in_(in_progress_content_ids))
+                .first()
+            )
             if content:
                 return self._format_content_response(content)
         
         # Query for available content
-        query = self.db.query(CurriculumContent)
+        query = self.db.query(CurriculumContent).options(*content_with_prerequisites())
         
         # Filter by topic if specified
         if topic_id:
@@ -166,8 +290,11 @@ class LearningPathGenerator:
         if not scored_content:
             return None
         
-        best_content = scored_content[0]
-        return self._format_content_response(best_content[0])
+        # Candidates are scanned without their content_data; fetch it for the
+        # chosen row only
+        best_content = scored_content[0][0]
+        self.db.refresh(best_content, attribute_names=["content_data"])
+        return self._format_content_response(best_content)
     
     def _score_content_for_user(
         self, 
@@ -187,137 +314,107 @@ class LearningPathGenerator:
             List of (content, score) tuples, sorted by descending score
         """
         # Extract user learning styles
-        learning_styles = [style.name for style in user.learning_styles]
+        style_idx = [STYLE_INDEX[LearningStyle[style.name]] for style in user.learning_styles]
         
         # Default to a balanced profile if no styles are set
-        if not learning_styles:
-            learning_styles = [LearningStyle.VISUAL, LearningStyle.KINESTHETIC]
+        if not style_idx:
+            style_idx = [STYLE_INDEX[LearningStyle.VISUAL], STYLE_INDEX[LearningStyle.KINESTHETIC]]
         
-        # Build progress lookup for quick access
-        progress_lookup = {p.content_id: p for p in progress_records}
+        completed_set = frozenset(
+            p.content_id for p in progress_records
+            if p.status in (CompletionStatus.COMPLETED, CompletionStatus.MASTERED)
+        )
         
-        scored_items = []
-        for content in contents:
-            # Skip content that has prerequisites not yet completed
-            if self._check_missing_prerequisites(content, progress_records):
-                continue
-            
-            base_score = 1.0
-            
-            # Factor 1: Content type suitability for learning style
-            style_score = 0
-            for style in learning_styles:
-                style_weights = LEARNING_STYLE_WEIGHTS.get(style, {})
-                style_score += style_weights.get(content.content_type, 0.7)
-            style_score /= len(learning_styles)
-            
-            # Factor 2: Appropriate difficulty level
-            difficulty_score = self._calculate_difficulty_score(user, content, progress_lookup)
-            
-            # Factor 3: Topic relevance (if we were tracking topic interests)
-            topic_score = 1.0  # Placeholder for future enhancement
-            
-            # Factor 4: Add small random factor to prevent identical recommendations
-            randomness = random.uniform(0.95, 1.05)
-            
-            # Calculate final score (weighted average)
-            final_score = (
-                style_score * 0.4 +
-                difficulty_score * 0.4 +
-                topic_score * 0.1
-            ) * randomness
-            
-            scored_items.append((content, final_score))
+        # Skip content that has prerequisites not yet completed
+        candidates = [
+            content for content in contents
+            if not self._check_missing_prerequisites(content, completed_set)
+        ]
+        if not candidates:
+            return []
+        
+        topic_slots, avg_topic_scores = self._build_topic_score_table(progress_records)
+        
+        scores = _score_candidates(
+            np.fromiter(
+                (topic_slots.get(c.topic_id, -1) for c in candidates),
+                dtype=np.int64, count=len(candidates)
+            ),
+            np.fromiter(
+                (CONTENT_TYPE_INDEX[c.content_type] for c in candidates),
+                dtype=np.int64, count=len(candidates)
+            ),
+            np.fromiter(
+                (DIFFICULTY_INDEX[c.difficulty_level] for c in candidates),
+                dtype=np.int64, count=len(candidates)
+            ),
+            avg_topic_scores,
+            STYLE_WEIGHT_TABLE,
+            np.array(style_idx, dtype=np.int64),
+            DIFFICULTY_SCORE_TABLE
+        )
+        
+        # Factor 4: Add small random factor to prevent identical recommendations
+        scores = scores * self._rng.uniform(0.95, 1.05, size=len(candidates))
         
         # Sort by score (descending)
-        return sorted(scored_items, key=lambda x: x[1], reverse=True)
+        order = np.argsort(-scores, kind="stable")
+        return [(candidates[i], float(scores[i])) for i in order]
     
-    def _calculate_difficulty_score(
-        self, 
-        user: User, 
-        content: CurriculumContent,
-        progress_lookup: Dict[int, Progress]
-    ) -> float:
+    def _build_topic_score_table(
+        self, progress_records: List[Progress]
+    ) -> Tuple[Dict[int, int], np.ndarray]:
         """
-        Calculate how appropriate the content difficulty is for the user.
+        Compute the user's average score for each topic they have worked on.
         
         Args:
-            user: The user to calculate for
-            content: The content item
-            progress_lookup: Dictionary mapping content IDs to progress records
+            progress_records: User's progress records
             
         Returns:
-            Difficulty appropriateness score (0-1)
+            Tuple of (topic ID -> slot mapping, average score per slot), where
+            the average is -1 for topics without any scores yet
         """
-        # Get user's average performance
-        topic_progress = [
-            p for p in progress_lookup.values() 
-            if p.content and p.content.topic_id == content.topic_id
-        ]
+        score_sums: Dict[int, float] = {}
+        score_counts: Dict[int, int] = {}
         
-        if not topic_progress:
-            # No data for this topic, give middle difficulty content higher scores
-            if content.difficulty_level in (DifficultyLevel.EASY, DifficultyLevel.MEDIUM):
-                return 0.9
-            return 0.7
-        
-        # Calculate average score on this topic
-        scores = [p.score for p in topic_progress if p.score is not None]
-        if not scores:
-            return 0.8  # No scores yet, slight preference for easier content
-        
-        avg_score = sum(scores) / len(scores)
-        
-        # Higher scores mean the user is ready for more difficult content
-        if avg_score > 90:  # Excellent performance
-            if content.difficulty_level in (DifficultyLevel.HARD, DifficultyLevel.EXPERT):
-                return 1.0
-            return 0.6
-        elif avg_score > 75:  # Good performance
-            if content.difficulty_level == DifficultyLevel.MEDIUM:
-                return 1.0
-            elif content.difficulty_level == DifficultyLevel.HARD:
-                return 0.8
-            return 0.5
-        elif avg_score > 60:  # Average performance
-            if content.difficulty_level in (DifficultyLevel.EASY, DifficultyLevel.MEDIUM):
-                return 0.9
-            return 0.4
-        else:  # Struggling
-            if content.difficulty_level == DifficultyLevel.BEGINNER:
-                return 1.0
-            elif content.difficulty_level == DifficultyLevel.EASY:
-                return 0.8
-            return 0.3
+        # One record per content item, matching the progress lookup by content ID
+        for p in {p.content_id: p for p in progress_records}.values():
+            if not p.content:
+                continue
+            
+            topic_id = p.content.topic_id
+            score_sums.setdefault(topic_id, 0.0)
+            score_counts.setdefault(topic_id, 0)
+            if p.score is not None:
+                score_sums[topic_id] += p.score
+                score_counts[topic_id] += 1
+        
+        topic_slots = {topic_id: i for i, topic_id in enumerate(score_sums)}
+        avg_topic_scores = np.array(
+            [
+                score_sums[topic_id] / score_counts[topic_id] if score_counts[topic_id] else -1.0
+                for topic_id in topic_slots
+            ],
+            dtype=np.float64
+        )
+        return topic_slots, avg_topic_scores
     
     def _check_missing_prerequisites(
         self, 
         content: CurriculumContent, 
-        progress_records: List[Progress]
+        completed_set: FrozenSet[int]
     ) -> bool:
         """
         Check if the content has prerequisites that haven't been completed.
         
         Args:
             content: The content to check
-            progress_records: List of user's progress records
+            completed_set: IDs of content the user has completed or mastered
             
         Returns:
             True if there are missing prerequisites, False otherwise
         """
-        if not content.prerequisites:
-            return False
-        
-        completed_content_ids = {
-            p.content_id for p in progress_records 
-            if p.status in (CompletionStatus.COMPLETED, CompletionStatus.MASTERED)
-        }
-        
-        for prereq in content.prerequisites:
-            if prereq.id not in completed_content_ids:
-                return True
-        
-        return False
+        return any(prereq.id not in completed_set for prereq in content.prerequisites)
     
     def _format_content_response(self, content: CurriculumContent) -> Dict:
         """Format content as a response dictionary."""
@@ -328,7 +425,7 @@ class LearningPathGenerator:
             "content_type": content.content_type.value,
             "difficulty_level": content.difficulty_level.value,
             "estimated_time_minutes": content.estimated_time_minutes,
-            "content_data": json.loads(content.content_data),
+            "content_data": content.content_data,
             "topic_id": content.topic_id,
         }
 
@@ -337,18 +434,33 @@ class LearningPathGenerator:
 import json
 import logging
 import math
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
-from sangram_tutor.models.curriculum import CurriculumContent, ContentType
+from sangram_tutor.models.curriculum import CurriculumContent, CurriculumTopic, ContentType
 from sangram_tutor.models.progress import Progress, CompletionStatus
 from sangram_tutor.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Position of each completion status in status-id arrays, used to bincount
+# every status category in a single pass
+STATUS_INDEX = {status: i for i, status in enumerate(CompletionStatus)}
+COMPLETED_IDX = STATUS_INDEX[CompletionStatus.COMPLETED]
+MASTERED_IDX = STATUS_INDEX[CompletionStatus.MASTERED]
+
+# Position of each content type in content-type-id arrays
+CONTENT_TYPES = list(ContentType)
+CONTENT_TYPE_INDEX = {content_type: i for i, content_type in enumerate(CONTENT_TYPES)}
+
+# Rows fetched per round trip when streaming a user's progress
+PROGRESS_YIELD_PER = 1000
+
 
 class PerformanceAnalyzer:
     """
@@ -373,10 +485,26 @@ class PerformanceAnalyzer:
             logger.error(f"User with ID {user_id} not found")
             return {"error": "User not found"}
         
-        # Get progress records
-        progress_records = self.db.query(Progress).filter(Progress.user_id == user_id).all()
+        # Stream progress as plain column rows (content columns are needed for
+        # topic and type metrics) and extract them into arrays once for all metrics
+        rows = self.db.execute(
+            select(
+                Progress.score,
+                Progress.status,
+                Progress.content_id,
+                CurriculumContent.topic_id,
+                CurriculumContent.content_type,
+                Progress.time_spent_seconds,
+                Progress.engagement_score,
+                Progress.last_interaction,
+            )
+            .outerjoin(CurriculumContent, Progress.content_id == CurriculumContent.id)
+            .where(Progress.user_id == user_id)
+            .execution_options(yield_per=PROGRESS_YIELD_PER)
+        )
+        arrays = self._materialize(rows)
         
-        if not progress_records:
+        if not arrays.statuses.size:
             return {
                 "message": "Not enough data for analysis",
                 "recommendations": [
@@ -384,19 +512,31 @@ class PerformanceAnalyzer:
                 ]
             }
         
+        # Aggregate by topic once for topic metrics and recommendations
+        topic_stats = self._aggregate_topics(arrays)
+        topic_avg = {
+            int(topic_id): float(score_sum / score_count)
+            for topic_id, score_sum, score_count in zip(
+                topic_stats.topic_ids, topic_stats.score_sums, topic_stats.score_counts
+            )
+            if score_count
+        }
+        topic_names = self._get_topic_names(list(topic_avg))
+        
         # Calculate performance metrics
-        overall_score = self._calculate_overall_score(progress_records)
-        topic_performance = self._calculate_topic_performance(progress_records)
-        strengths_weaknesses = self._identify_strengths_weaknesses(progress_records)
-        learning_patterns = self._analyze_learning_patterns(progress_records)
-        engagement_metrics = self._calculate_engagement_metrics(progress_records)
+        overall_score = self._calculate_overall_score(arrays)
+        topic_performance = self._calculate_topic_performance(topic_stats, topic_names)
+        strengths_weaknesses = self._identify_strengths_weaknesses(arrays)
+        learning_patterns = self._analyze_learning_patterns(arrays)
+        engagement_metrics = self._calculate_engagement_metrics(arrays)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
             user, 
-            progress_records, 
             strengths_weaknesses, 
-            engagement_metrics
+            engagement_metrics,
+            topic_avg=topic_avg,
+            topic_names=topic_names
         )
         
         return {
@@ -408,28 +548,67 @@ class PerformanceAnalyzer:
             "recommendations": recommendations
         }
     
-    def _calculate_overall_score(self, progress_records: List[Progress]) -> Dict:
+    def _materialize(self, rows: Iterable[Row]) -> SimpleNamespace:
+        """
+        Extract progress columns into parallel NumPy arrays.
+        
+        Missing floats are stored as NaN, missing ids as -1 and missing
+        timestamps as NaT.
+        
+        Args:
+            rows: (score, status, content_id, topic_id, content_type,
+                time_spent_seconds, engagement_score, last_interaction) rows
+            
+        Returns:
+            Namespace of arrays, one element per progress row
+        """
+        scores, statuses, content_ids, topic_ids, ctype_ids = [], [], [], [], []
+        times, engagement, timestamps = [], [], []
+        
+        for (score, status, content_id, topic_id, content_type,
+                time_spent, engagement_score, last_interaction) in rows:
+            scores.append(score)
+            statuses.append(STATUS_INDEX.get(status, 0))
+            content_ids.append(content_id)
+            topic_ids.append(topic_id if topic_id is not None else -1)
+            ctype_ids.append(CONTENT_TYPE_INDEX.get(content_type, -1))
+            times.append(time_spent)
+            engagement.append(engagement_score)
+            timestamps.append(last_interaction)
+        
+        statuses = np.array(statuses, dtype=np.int8)
+        status_counts = np.bincount(statuses, minlength=len(CompletionStatus))
+        
+        return SimpleNamespace(
+            scores=np.array(scores, dtype=np.float64),
+            statuses=statuses,
+            status_counts=status_counts,
+            completed=(statuses == COMPLETED_IDX) | (statuses == MASTERED_IDX),
+            content_ids=np.array(content_ids, dtype=np.int64),
+            topic_ids=np.array(topic_ids, dtype=np.int64),
+            ctype_ids=np.array(ctype_ids, dtype=np.int8),
+            times=np.array(times, dtype=np.float64),
+            engagement=np.array(engagement, dtype=np.float64),
+            timestamps=np.array(timestamps, dtype="datetime64[us]"),
+        )
+    
+    def _calculate_overall_score(self, arrays: SimpleNamespace) -> Dict:
         """Calculate overall performance score and related metrics."""
-        scores = [p.score for p in progress_records if p.score is not None]
+        scores = arrays.scores[~np.isnan(arrays.scores)]
+        total_activities = len(arrays.statuses)
         
-        if not scores:
+        if not scores.size:
             return {
                 "average_score": None,
-                "total_activities": len(progress_records),
+                "total_activities": total_activities,
                 "completed_activities": 0,
                 "mastery_level": "Not enough data"
             }
         
-        completed_count = sum(
-            1 for p in progress_records 
-            if p.status in (CompletionStatus.COMPLETED, CompletionStatus.MASTERED)
-        )
-        
-        mastery_count = sum(
-            1 for p in progress_records if p.status == CompletionStatus.MASTERED
-        )
+        mastery_count = int(arrays.status_counts[MASTERED_IDX])
+        completed_count = int(arrays.status_counts[COMPLETED_IDX]) + mastery_count
         
-        avg_score = sum(scores) / len(scores)
+        avg_score = float(scores.mean())
         
         # Determine mastery level
         if avg_score >= 90 and mastery_count > 5:
@@ -445,92 +624,105 @@ class PerformanceAnalyzer:
         
         return {
             "average_score": round(avg_score, 1),
-            "total_activities": len(progress_records),
+            "total_activities": total_activities,
             "completed_activities": completed_count,
             "mastery_level": mastery_level
         }
     
-    def _calculate_topic_performance(self, progress_records: List[Progress]) -> List[Dict]:
-        """Calculate performance metrics by topic."""
-        # Group progress by topic
-        topic_progress = {}
-        
-        for progress in progress_records:
-            if not progress.content:
-                continue
-                
-            topic_id = progress.content.topic_id
-            if topic_id not in topic_progress:
-                topic_progress[topic_id] = []
-            
-            topic_progress[topic_id].append(progress)
+    def _aggregate_topics(self, arrays: SimpleNamespace) -> SimpleNamespace:
+        """
+        Aggregate progress arrays by topic.
         
-        # Calculate metrics for each topic
+        Topics are ordered by the user's first activity in them. Records
+        without content have no topic and are skipped.
+        """
+        has_topic = arrays.topic_ids >= 0
+        topic_ids, first_index, inverse = np.unique(
+            arrays.topic_ids[has_topic], return_index=True, return_inverse=True
+        )
+        topic_count = len(topic_ids)
+        
+        scores = arrays.scores[has_topic]
+        scored = ~np.isnan(scores)
+        
+        highest_scores = np.full(topic_count, -np.inf)
+        np.maximum.at(highest_scores, inverse[scored], scores[scored])
+        
+        order = np.argsort(first_index)
+        return SimpleNamespace(
+            topic_ids=topic_ids[order],
+            totals=np.bincount(inverse, minlength=topic_count)[order],
+            completed=np.bincount(
+                inverse, weights=arrays.completed[has_topic], minlength=topic_count
+            )[order],
+            score_counts=np.bincount(inverse[scored], minlength=topic_count)[order],
+            score_sums=np.bincount(
+                inverse[scored], weights=scores[scored], minlength=topic_count
+            )[order],
+            highest_scores=highest_scores[order],
+        )
+    
+    def _get_topic_names(self, topic_ids: List[int]) -> Dict[int, str]:
+        """Look up the names of the given topics in a single query."""
+        if not topic_ids:
+            return {}
+        
+        rows = self.db.query(CurriculumTopic.id, CurriculumTopic.name).filter(
+            CurriculumTopic.id.in_(topic_ids)
+        ).all()
+        return {topic_id: name for topic_id, name in rows}
+    
+    def _calculate_topic_performance(
+        self, topic_stats: SimpleNamespace, topic_names: Dict[int, str]
+    ) -> List[Dict]:
+        """Calculate performance metrics by topic."""
         result = []
-        for topic_id, records in topic_progress.items():
-            topic = self.db.query(CurriculumTopic).filter_by(id=topic_id).first()
-            if not topic:
+        for i, topic_id in enumerate(topic_stats.topic_ids.tolist()):
+            topic_name = topic_names.get(topic_id)
+            if topic_name is None or not topic_stats.score_counts[i]:
                 continue
                 
-            scores = [p.score for p in records if p.score is not None]
-            if not scores:
-                continue
-                
-            avg_score = sum(scores) / len(scores)
-            max_score = max(scores)
-            
-            completed = sum(
-                1 for p in records 
-                if p.status in (CompletionStatus.COMPLETED, CompletionStatus.MASTERED)
-            )
-            total = len(records)
+            avg_score = topic_stats.score_sums[i] / topic_stats.score_counts[i]
+            total = int(topic_stats.totals[i])
             
             result.append({
                 "topic_id": topic_id,
-                "topic_name": topic.name,
-                "average_score": round(avg_score, 1),
-                "highest_score": round(max_score, 1),
-                "completion_rate": round(completed / total * 100 if total > 0 else 0, 1),
+                "topic_name": topic_name,
+                "average_score": round(float(avg_score), 1),
+                "highest_score": round(float(topic_stats.highest_scores[i]), 1),
+                "completion_rate": round(float(topic_stats.completed[i]) / total * 100, 1),
                 "activity_count": total
             })
         
         # Sort by average score (descending)
         return sorted(result, key=lambda x: x["average_score"], reverse=True)
     
-    def _identify_strengths_weaknesses(self, progress_records: List[Progress]) -> Dict:
+    def _identify_strengths_weaknesses(self, arrays: SimpleNamespace) -> Dict:
         """Identify areas of strength and weakness based on performance data."""
-        # Group by content type
-        type_performance = {}
-        
-        for progress in progress_records:
-            if not progress.content or progress.score is None:
-                continue
-                
-            content_type = progress.content.content_type
-            if content_type not in type_performance:
-                type_performance[content_type] = []
-            
-            type_performance[content_type].append(progress.score)
-        
-        # Calculate average score by content type
-        strengths = []
-        weaknesses = []
-        
-        for content_type, scores in type_performance.items():
-            if not scores:
-                continue
-                
-            avg_score = sum(scores) / len(scores)
-            item = {
-                "content_type": content_type.value,
-                "average_score": round(avg_score, 1),
-                "activity_count": len(scores)
-            }
-            
-            if avg_score >= 75:
-                strengths.append(item)
-            elif avg_score < 60:
-                weaknesses.append(item)
+        # Average score by content type (records without content or score are skipped)
+        mask = ~np.isnan(arrays.scores) & (arrays.ctype_ids >= 0)
+        ctype_ids = arrays.ctype_ids[mask]
+        sums = np.bincount(ctype_ids, weights=arrays.scores[mask], minlength=len(CONTENT_TYPES))
+        counts = np.bincount(ctype_ids, minlength=len(CONTENT_TYPES))
+        avgs = sums / np.maximum(counts, 1)
+        
+        # Content types in order of first appearance, so equal averages keep
+        # that order through the stable sorts below
+        seen_types, first_index = np.unique(ctype_ids, return_index=True)
+        seen_types = seen_types[np.argsort(first_index)]
+        
+        def summarize(type_mask: np.ndarray) -> List[Dict]:
+            return [
+                {
+                    "content_type": CONTENT_TYPES[i].value,
+                    "average_score": round(float(avgs[i]), 1),
+                    "activity_count": int(counts[i])
+                }
+                for i in seen_types[type_mask[seen_types]].tolist()
+            ]
+        
+        strengths = summarize(avgs >= 75)
+        weaknesses = summarize(avgs < 60)
         
         # Sort strengths and weaknesses
         strengths = sorted(strengths, key=lambda x: x["average_score"], reverse=True)
@@ -541,54 +733,48 @@ class PerformanceAnalyzer:
             "weaknesses": weaknesses
         }
     
-    def _analyze_learning_patterns(self, progress_records: List[Progress]) -> Dict:
+    def _analyze_learning_patterns(self, arrays: SimpleNamespace) -> Dict:
         """Analyze patterns in learning behavior and progress over time."""
         # Group activities by date
-        daily_activity = {}
-        
-        for progress in progress_records:
-            if not progress.last_interaction:
-                continue
-                
-            date_key = progress.last_interaction.strftime("%Y-%m-%d")
-            if date_key not in daily_activity:
-                daily_activity[date_key] = []
-            
-            daily_activity[date_key].append(progress)
+        timed = ~np.isnat(arrays.timestamps)
+        timestamps = arrays.timestamps[timed]
+        days = timestamps.astype("datetime64[D]")
+        dates, day_index = np.unique(days, return_inverse=True)
+        date_count = len(dates)
+        
+        scores = arrays.scores[timed]
+        scored = ~np.isnan(scores)
+        
+        activity_counts = np.bincount(day_index, minlength=date_count)
+        score_counts = np.bincount(day_index[scored], minlength=date_count)
+        score_sums = np.bincount(
+            day_index[scored], weights=scores[scored], minlength=date_count
+        )
+        total_times = np.bincount(
+            day_index, weights=np.nan_to_num(arrays.times[timed]), minlength=date_count
+        )
         
-        # Calculate daily metrics
+        # Calculate daily metrics for the last 7 active days
         daily_metrics = []
         
-        for date_key, activities in sorted(daily_activity.items()):
-            scores = [p.score for p in activities if p.score is not None]
-            avg_score = sum(scores) / len(scores) if scores else None
-            
-            total_time = sum(p.time_spent_seconds for p in activities if p.time_spent_seconds)
+        for i in range(max(date_count - 7, 0), date_count):
+            avg_score = score_sums[i] / score_counts[i] if score_counts[i] else None
+            total_time = float(total_times[i])
             
             daily_metrics.append({
-                "date": date_key,
-                "activity_count": len(activities),
-                "average_score": round(avg_score, 1) if avg_score is not None else None,
+                "date": str(dates[i]),
+                "activity_count": int(activity_counts[i]),
+                "average_score": round(float(avg_score), 1) if avg_score is not None else None,
                 "total_time_minutes": round(total_time / 60, 1) if total_time else 0
             })
         
         # Calculate preferred time patterns (if timestamps available)
-        morning_count = afternoon_count = evening_count = 0
+        hours = (timestamps - days).astype("timedelta64[h]").astype(np.int64)
+        morning_count = int(np.count_nonzero((hours >= 5) & (hours < 12)))
+        afternoon_count = int(np.count_nonzero((hours >= 12) & (hours < 17)))
+        evening_count = len(hours) - morning_count - afternoon_count
         
-        for progress in progress_records:
-            if not progress.last_interaction:
-                continue
-                
-            hour = progress.last_interaction.hour
-            
-            if 5 <= hour < 12:
-                morning_count += 1
-            elif 12 <= hour < 17:
-                afternoon_count += 1
-            else:
-                evening_count += 1
-        
-        total_with_time = morning_count + afternoon_count + evening_count
+        total_with_time = len(hours)
         
         time_distribution = {
             "morning": round(morning_count / total_with_time * 100 if total_with_time else 0, 1),
@@ -597,41 +783,24 @@ class PerformanceAnalyzer:
         }
         
         return {
-            "daily_activity": daily_metrics[-7:],  # Last 7 days
+            "daily_activity": daily_metrics,
             "time_distribution": time_distribution,
-            "total_learning_time_minutes": round(
-                sum(p.time_spent_seconds for p in progress_records if p.time_spent_seconds) / 60, 
-                1
-            )
+            "total_learning_time_minutes": round(float(np.nansum(arrays.times)) / 60, 1)
         }
     
-    def _calculate_engagement_metrics(self, progress_records: List[Progress]) -> Dict:
+    def _calculate_engagement_metrics(self, arrays: SimpleNamespace) -> Dict:
         """Calculate user engagement metrics."""
         # Get unique dates with activity
-        active_dates = set()
-        last_active = None
-        total_activities = len(progress_records)
-        
-        for progress in progress_records:
-            if not progress.last_interaction:
-                continue
-                
-            active_dates.add(progress.last_interaction.date())
-            
-            if last_active is None or progress.last_interaction > last_active:
-                last_active = progress.last_interaction
+        timestamps = arrays.timestamps[~np.isnat(arrays.timestamps)]
+        active_dates = np.unique(timestamps.astype("datetime64[D]"))
+        last_active = timestamps.max().item() if timestamps.size else None
+        total_activities = len(arrays.statuses)
         
-        # Count consecutive days (if any)
+        # Count consecutive days ending at the most recent active date
         consecutive_days = 0
-        if active_dates:
-            sorted_dates = sorted(active_dates, reverse=True)
-            consecutive_days = 1
-            
-            for i in range(1, len(sorted_dates)):
-                if sorted_dates[i-1] - sorted_dates[i] == timedelta(days=1):
-                    consecutive_days += 1
-                else:
-                    break
+        if active_dates.size:
+            gaps = np.flatnonzero(np.diff(active_dates[::-1]) != np.timedelta64(-1, "D"))
+            consecutive_days = int(gaps[0]) + 1 if gaps.size else len(active_dates)
         
         # Is currently active?
         is_active = False
@@ -640,17 +809,12 @@ class PerformanceAnalyzer:
             is_active = days_since_active < 7
         
         # Calculate completion rate
-        completed = sum(
-            1 for p in progress_records 
-            if p.status in (CompletionStatus.COMPLETED, CompletionStatus.MASTERED)
-        )
+        completed = int(arrays.status_counts[COMPLETED_IDX] + arrays.status_counts[MASTERED_IDX])
         completion_rate = round(completed / total_activities * 100 if total_activities > 0 else 0, 1)
         
         # Average engagement score
-        engagement_scores = [
-            p.engagement_score for p in progress_records if p.engagement_score is not None
-        ]
-        avg_engagement = sum(engagement_scores) / len(engagement_scores) if engagement_scores else None
+        engagement_scores = arrays.engagement[~np.isnan(arrays.engagement)]
+        avg_engagement = float(engagement_scores.mean()) if engagement_scores.size else None
         
         return {
             "active_days": len(active_dates),
@@ -664,9 +828,10 @@ class PerformanceAnalyzer:
     def _generate_recommendations(
         self,
         user: User,
-        progress_records: List[Progress],
         strengths_weaknesses: Dict,
-        engagement_metrics: Dict
+        engagement_metrics: Dict,
+        topic_avg: Dict[int, float],
+        topic_names: Dict[int, str]
     ) -> List[str]:
         """Generate personalized recommendations based on performance analysis."""
         recommendations = []
@@ -707,27 +872,12 @@ class PerformanceAnalyzer:
             )
         
         # Topic-specific recommendations
-        topic_records = {}
-        for progress in progress_records:
-            if not progress.content:
-                continue
-                
-            topic_id = progress.content.topic_id
-            if topic_id not in topic_records:
-                topic_records[topic_id] = []
-            topic_records[topic_id].append(progress)
-        
-        for topic_id, records in topic_records.items():
-            scores = [p.score for p in records if p.score is not None]
-            if not scores:
-                continue
-            
-            avg_score = sum(scores) / len(scores)
-            topic = self.db.query(CurriculumTopic).filter_by(id=topic_id).first()
+        for topic_id, avg_score in topic_avg.items():
+            topic_name = topic_names.get(topic_id)
             
-            if topic and avg_score < 60:
+            if topic_name is not None and avg_score < 60:
                 recommendations.append(
-                    f"Focus on improving your understanding of '{topic.name}' concepts."
+                    f"Focus on improving your understanding of '{topic_name}' concepts."
                 )
         
         # Limit to top 5 recommendations
@@ -56,8 +56,8 @@ uvicorn==0.27.1
 pydantic==2.6.1
 sqlalchemy==2.0.25
 alembic==1.13.1
-python-jose==3.3.0
-passlib==1.7.4
+PyJWT==2.8.0
+bcrypt==4.1.2
 python-multipart==0.0.6
 pytest==7.4.4
 httpx==0.26.0
@@ -82,4 +82,11 @@ EOL
 
 chmod +x setup_venv.sh
 
+# Create pytest configuration; tests hash with the minimum bcrypt cost
+cat > sangram_tutor/tests/conftest.py << EOL
+import os
+
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+EOL
+
 echo "Project structure created successfully!"
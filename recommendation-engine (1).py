@@ -3,22 +3,55 @@ import json
 import logging
 import math
 import random
+import threading
+from dataclasses import dataclass
 import faiss
 import numpy as np
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
 
+from sqlalchemy import event, tuple_
 from sqlalchemy.orm import Session
 
+from sangram_tutor.models.cache import get_content
 from sangram_tutor.models.curriculum import CurriculumContent, CurriculumTopic
-from sangram_tutor.models.progress import Progress
+from sangram_tutor.models.loaders import progress_with_content
+from sangram_tutor.models.progress import Progress, CompletionStatus
 from sangram_tutor.models.user import User
+from sangram_tutor.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Directory where vector indices are stored
 VECTOR_DIR = Path("./vector_indices")
 
+# Recent results shared by every recommender in the process. Similar-content
+# results are keyed by (content_id, limit); personalized results are keyed by
+# user_id and hold one result list per limit, so a user's entries can be
+# dropped together when their progress changes.
+_similar_cache = TTLCache(maxsize=2000, ttl=300)
+_personalized_cache = TTLCache(maxsize=2000, ttl=60)
+
+# Vector index and its ID maps, loaded once per process and shared by every
+# recommender in it. Stored as (signature, index, id_mapping, id_to_idx,
+# idx_to_id); the signature holds the index path and file mtimes, so a
+# rebuilt index is picked up by the next recommender created.
+_INDEX_CACHE: Optional[Tuple] = None
+_INDEX_LOCK = threading.Lock()
+
+# Ordinal position of each difficulty level, used to detect adjacent levels
+DIFFICULTY_RANK = {"beginner": 0, "easy": 1, "medium": 2, "hard": 3, "expert": 4}
+
+
+@dataclass(slots=True)
+class TopicStats:
+    """Per-topic interaction totals for topic-based recommendations."""
+    count: int = 0
+    score_sum: float = 0.0
+    score_count: int = 0
+    avg_score: Optional[float] = None
+
 
 class ContentRecommender:
     """
@@ -30,6 +63,11 @@ class ContentRecommender:
         self.db = db
         self.index = None
         self.id_mapping = None
+        self.id_to_idx: Dict[int, int] = {}
+        self.idx_to_id: Dict[int, int] = {}
+        # Query embedding buffers reused across searches
+        self._query_buf: Optional[np.ndarray] = None
+        self._query_buf_batch: Optional[np.ndarray] = None
         self._load_vector_index()
     
     def _load_vector_index(self) -> None:
@@ -39,14 +77,15 @@ class ContentRecommender:
         
         if index_path.exists() and mapping_path.exists():
             try:
-                self.index = faiss.read_index(str(index_path))
-                with open(mapping_path, 'r') as f:
-                    self.id_mapping = json.load(f)
-                logger.info("Successfully loaded vector index and mapping")
+                _, self.index, self.id_mapping, self.id_to_idx, self.idx_to_id = _get_shared_index(
+                    index_path, mapping_path
+                )
             except Exception as e:
                 logger.error(f"Error loading vector index: {e}")
                 self.index = None
                 self.id_mapping = None
+                self.id_to_idx = {}
+                self.idx_to_id = {}
         else:
             logger.warning("Vector index or mapping file not found")
     
@@ -61,62 +100,205 @@ class ContentRecommender:
         Returns:
             List of similar content items with similarity scores
         """
+        key = (content_id, limit)
+        cached = _similar_cache.get(key)
+        if cached is not None:
+            return _copy_results(cached)
+        
+        results = self._find_similar_content(content_id, limit)
+        _similar_cache.set(key, _copy_results(results))
+        return results
+    
+    def _find_similar_content(self, content_id: int, limit: int) -> List[Dict]:
+        """Run the vector search behind get_similar_content."""
         if not self.index or not self.id_mapping:
             logger.warning("Vector index not loaded, can't find similar content")
             return self._fallback_recommendations(content_id, limit)
         
         # Find content in database
-        content = self.db.query(CurriculumContent).filter_by(id=content_id).first()
+        content = get_content(self.db, content_id)
         if not content:
             logger.error(f"Content with ID {content_id} not found")
             return []
         
         # Find content index in vector database
-        content_idx = None
-        for idx, c_id in self.id_mapping.items():
-            if int(c_id) == content_id:
-                content_idx = int(idx)
-                break
-        
+        content_idx = self.id_to_idx.get(content_id)
         if content_idx is None:
             logger.warning(f"Content ID {content_id} not found in vector index")
             return self._fallback_recommendations(content_id, limit)
         
-        # Get the embedding for this content
-        embedding = np.zeros((1, self.index.d), dtype=np.float32)
-        faiss.reconstruct(self.index, content_idx, embedding[0])
+        # Copy the embedding for this content into the reusable query buffer
+        if self._query_buf is None or self._query_buf.shape[1] != self.index.d:
+            self._query_buf = np.empty((1, self.index.d), dtype=np.float32)
+        self.index.reconstruct(content_idx, self._query_buf[0])
         
         # Search for similar content
         k = min(limit + 1, self.index.ntotal)  # +1 to account for self-match
-        distances, indices = self.index.search(embedding, k)
+        distances, indices = self.index.search(self._query_buf, k)
         
-        # Format results (excluding the query content itself)
-        results = []
-        for i, idx in enumerate(indices[0]):
+        # Convert distances to similarity scores on a 0-100 scale
+        similarities = np.maximum(0.0, 100.0 - distances[0] * 10.0)
+        
+        # Load all neighbouring content in one query
+        neighbours = self._resolve_neighbours(content_idx, similarities, indices[0])
+        content_by_id = self._load_content_by_id(c_id for c_id, _ in neighbours)
+        
+        return self._build_similar_results(neighbours, content_by_id, limit)
+    
+    def get_similar_content_batch(
+        self, content_ids: List[int], limit: int = 5
+    ) -> Dict[int, List[Dict]]:
+        """
+        Find similar content for several content IDs with a single index search.
+        
+        Args:
+            content_ids: IDs of the content to find similar items for
+            limit: Maximum number of similar items to return per content ID
+            
+        Returns:
+            Dictionary mapping each content ID to its list of similar content items
+        """
+        if not self.index or not self.id_mapping:
+            logger.warning("Vector index not loaded, can't find similar content")
+            return {
+                content_id: self._fallback_recommendations(content_id, limit)
+                for content_id in content_ids
+            }
+        
+        # Check which content exists in a single query
+        existing_ids = {
+            content_id for (content_id,) in self.db.query(CurriculumContent.id).filter(
+                CurriculumContent.id.in_(content_ids)
+            )
+        }
+        
+        results = {}
+        indexed_ids = []
+        for content_id in dict.fromkeys(content_ids):
+            if content_id not in existing_ids:
+                logger.error(f"Content with ID {content_id} not found")
+                results[content_id] = []
+            elif content_id not in self.id_to_idx:
+                logger.warning(f"Content ID {content_id} not found in vector index")
+                results[content_id] = self._fallback_recommendations(content_id, limit)
+            else:
+                indexed_ids.append(content_id)
+        
+        if indexed_ids:
+            # Stack all query embeddings and search them together
+            embeddings = self._batch_query_buffer(len(indexed_ids))
+            self.index.reconstruct_batch(
+                np.fromiter((self.id_to_idx[c_id] for c_id in indexed_ids), dtype=np.int64),
+                embeddings
+            )
+            
+            k = min(limit + 1, self.index.ntotal)  # +1 to account for self-match
+            distances, indices = self.index.search(embeddings, k)
+            
+            # Convert distances to similarity scores on a 0-100 scale
+            similarities = np.maximum(0.0, 100.0 - distances * 10.0)
+            
+            neighbours_by_content = {
+                content_id: self._resolve_neighbours(
+                    self.id_to_idx[content_id], similarities[row], indices[row]
+                )
+                for row, content_id in enumerate(indexed_ids)
+            }
+            
+            # Load the neighbouring content of every row in one query
+            content_by_id = self._load_content_by_id(
+                c_id for neighbours in neighbours_by_content.values() for c_id, _ in neighbours
+            )
+            for content_id, neighbours in neighbours_by_content.items():
+                results[content_id] = self._build_similar_results(neighbours, content_by_id, limit)
+        
+        return {content_id: results[content_id] for content_id in content_ids}
+    
+    def _batch_query_buffer(self, rows: int) -> np.ndarray:
+        """
+        Return a reusable (rows, d) query buffer for batched searches.
+        
+        The backing array grows geometrically, so a run of increasing batch
+        sizes reallocates only a logarithmic number of times.
+        
+        Args:
+            rows: Number of query embeddings the buffer must hold
+            
+        Returns:
+            Contiguous float32 view of the first rows rows of the buffer
+        """
+        buf = self._query_buf_batch
+        if buf is None or buf.shape[1] != self.index.d or buf.shape[0] < rows:
+            capacity = rows if buf is None else max(rows, 2 * buf.shape[0])
+            buf = self._query_buf_batch = np.empty((capacity, self.index.d), dtype=np.float32)
+        return buf[:rows]
+    
+    def _resolve_neighbours(
+        self, content_idx: int, similarities: np.ndarray, indices: np.ndarray
+    ) -> List[Tuple[int, float]]:
+        """
+        Map one row of index search output back to content IDs.
+        
+        Args:
+            content_idx: Index position of the query content (excluded from results)
+            similarities: Similarity scores of the neighbours, nearest first
+            indices: Index positions of the neighbours
+            
+        Returns:
+            List of (content ID, similarity) pairs, nearest first
+        """
+        neighbours = []
+        for i, idx in enumerate(indices):
             # Skip self-match
             if int(idx) == content_idx:
                 continue
                 
             # Get the content ID from the mapping
-            similar_content_id = int(self.id_mapping.get(str(int(idx)), -1))
+            similar_content_id = self.idx_to_id.get(int(idx), -1)
             if similar_content_id == -1:
                 continue
-                
-            # Get content from database
-            similar_content = self.db.query(CurriculumContent).filter_by(id=similar_content_id).first()
+            
+            neighbours.append((similar_content_id, similarities[i]))
+        
+        return neighbours
+    
+    def _load_content_by_id(self, content_ids: Iterable[int]) -> Dict[int, CurriculumContent]:
+        """Load content items with a single IN query, keyed by ID."""
+        content_ids = list(set(content_ids))
+        if not content_ids:
+            return {}
+        
+        return {
+            content.id: content
+            for content in self.db.query(CurriculumContent).filter(
+                CurriculumContent.id.in_(content_ids)
+            )
+        }
+    
+    def _build_similar_results(
+        self,
+        neighbours: List[Tuple[int, float]],
+        content_by_id: Dict[int, CurriculumContent],
+        limit: int
+    ) -> List[Dict]:
+        """
+        Format resolved neighbours as similar content items.
+        
+        Args:
+            neighbours: (content ID, similarity) pairs, nearest first
+            content_by_id: Loaded content items keyed by ID
+            limit: Maximum number of similar items to return
+            
+        Returns:
+            List of similar content items with similarity scores
+        """
+        results = []
+        for similar_content_id, similarity in neighbours:
+            similar_content = content_by_id.get(similar_content_id)
             if not similar_content:
                 continue
-                
-            # Calculate similarity score (convert distance to similarity)
-            similarity = max(0, 100 - distances[0][i] * 10)  # Scale to 0-100
             
-            results.append({
-                "id": similar_content.id,
-                "title": similar_content.title,
-                "similarity_score": round(float(similarity), 2),
-                "content_type": similar_content.content_type.value,
-                "difficulty_level": similar_content.difficulty_level.value
-            })
+            results.append(_similar_result(similar_content, similarity))
             
             if len(results) >= limit:
                 break
@@ -136,13 +318,18 @@ class ContentRecommender:
             List of similar content items with similarity scores
         """
         # Find content in database
-        content = self.db.query(CurriculumContent).filter_by(id=content_id).first()
+        content = get_content(self.db, content_id)
         if not content:
             logger.error(f"Content with ID {content_id} not found")
             return []
         
         # Find other content in the same topic with similar difficulty
-        similar_content = self.db.query(CurriculumContent).filter(
+        similar_content = self.db.query(
+            CurriculumContent.id,
+            CurriculumContent.title,
+            CurriculumContent.content_type,
+            CurriculumContent.difficulty_level
+        ).filter(
             CurriculumContent.topic_id == content.topic_id,
             CurriculumContent.id != content_id
         ).limit(limit * 2).all()
@@ -150,33 +337,25 @@ class ContentRecommender:
         if not similar_content:
             return []
         
-        # Score similarity based on metadata
+        n = len(similar_content)
+        ranks = np.fromiter(
+            (DIFFICULTY_RANK[row.difficulty_level.value] for row in similar_content), dtype=np.int64, count=n
+        )
+        same_type = np.fromiter(
+            (row.content_type == content.content_type for row in similar_content), dtype=bool, count=n
+        )
+        
+        # Score similarity based on metadata: 70 for the same topic, +20 for the
+        # same difficulty, +10 for an adjacent difficulty, +10 for the same type
+        rank_gap = np.abs(ranks - DIFFICULTY_RANK[content.difficulty_level.value])
+        similarity = 70.0 + 20.0 * (rank_gap == 0) + 10.0 * (rank_gap == 1) + 10.0 * same_type
+        
+        # Sort by similarity (highest first, ties in query order) and limit results
         results = []
-        for item in similar_content:
-            # Base similarity score
-            similarity = 70.0  # Start with 70% similarity for same topic
-            
-            # Adjust based on difficulty difference
-            if item.difficulty_level == content.difficulty_level:
-                similarity += 20.0
-            elif abs(ord(item.difficulty_level.value[0]) - ord(content.difficulty_level.value[0])) == 1:
-                similarity += 10.0  # Adjacent difficulty levels
-            
-            # Adjust based on content type
-            if item.content_type == content.content_type:
-                similarity += 10.0
-            
-            results.append({
-                "id": item.id,
-                "title": item.title,
-                "similarity_score": round(similarity, 2),
-                "content_type": item.content_type.value,
-                "difficulty_level": item.difficulty_level.value
-            })
-        
-        # Sort by similarity (highest first) and limit results
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return results[:limit]
+        for i in np.argsort(-similarity, kind="stable")[:limit].tolist():
+            results.append(_similar_result(similar_content[i], similarity[i]))
+        
+        return results
     
     def get_personalized_recommendations(self, user_id: int, limit: int = 5) -> List[Dict]:
         """
@@ -189,53 +368,200 @@ class ContentRecommender:
         Returns:
             List of recommended content items with relevance scores
         """
+        cached = _personalized_cache.get(user_id, {})
+        if limit in cached:
+            return _copy_results(cached[limit])
+        
+        results = self._recommend_for_user(user_id, limit)
+        _personalized_cache.set(user_id, {**cached, limit: _copy_results(results)})
+        return results
+    
+    def _recommend_for_user(self, user_id: int, limit: int) -> List[Dict]:
+        """Build the recommendations behind get_personalized_recommendations."""
         user = self.db.query(User).filter_by(id=user_id).first()
         if not user:
             logger.error(f"User with ID {user_id} not found")
             return []
         
-        # Get user's progress data
-        progress = self.db.query(Progress).filter_by(user_id=user_id).all()
-        
-        # If user has no progress, recommend beginner content for their grade
-        if not progress:
+        # If user has no completed progress, recommend beginner content for their grade
+        seed_content_id = self._query_seed_content(user_id)
+        if seed_content_id is None:
             return self._recommend_for_new_user(user, limit)
         
+        # Get similar content to the seed
+        similar_content = self.get_similar_content(seed_content_id, limit=limit*2)
+        
+        # Everything the user has touched is excluded from recommendations
+        completed_ids = {
+            content_id
+            for (content_id,) in self.db.query(Progress.content_id).filter_by(user_id=user_id)
+        }
+        
+        return self._merge_recommendations(user, completed_ids, similar_content, limit)
+    
+    def get_personalized_recommendations_batch(
+        self, user_ids: List[int], limit: int = 5
+    ) -> Dict[int, List[Dict]]:
+        """
+        Generate personalized recommendations for several users at once.
+        
+        Users and progress are loaded with one query each, and the seed
+        content of all users is searched in a single index query.
+        
+        Args:
+            user_ids: IDs of the users to generate recommendations for
+            limit: Maximum number of recommendations to return per user
+            
+        Returns:
+            Dictionary mapping each user ID to its list of recommended content items
+        """
+        users = {user.id: user for user in self.db.query(User).filter(User.id.in_(user_ids))}
+        
+        progress_by_user = {user_id: [] for user_id in users}
+        progress_records = (
+            self.db.query(Progress)
+            .options(*progress_with_content())
+            .filter(Progress.user_id.in_(list(users)))
+        )
+        for p in progress_records:
+            progress_by_user[p.user_id].append(p)
+        
+        results = {}
+        seed_by_user = {}
+        for user_id in user_ids:
+            user = users.get(user_id)
+            if not user:
+                logger.error(f"User with ID {user_id} not found")
+                results[user_id] = []
+                continue
+            
+            seed_content_id = self._select_seed_content(progress_by_user[user_id])
+            if seed_content_id is None:
+                results[user_id] = self._recommend_for_new_user(user, limit)
+            else:
+                seed_by_user[user_id] = seed_content_id
+        
+        # Search similar content for every distinct seed together
+        similar_by_seed = self.get_similar_content_batch(
+            list(dict.fromkeys(seed_by_user.values())), limit=limit*2
+        )
+        for user_id, seed_content_id in seed_by_user.items():
+            progress = progress_by_user[user_id]
+            results[user_id] = self._merge_recommendations(
+                users[user_id],
+                {p.content_id for p in progress},
+                similar_by_seed[seed_content_id],
+                limit,
+                progress
+            )
+        
+        return {user_id: results[user_id] for user_id in user_ids}
+    
+    def _query_seed_content(self, user_id: int) -> Optional[int]:
+        """
+        Pick the seed content for a user in SQL.
+        
+        Same choice as _select_seed_content, but only the five most recent
+        scored completions are fetched, as (content_id, score) rows.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            ID of the seed content, or None if the user has no scored completions
+        """
+        recent_completions = (
+            self.db.query(Progress.content_id, Progress.score)
+            .filter(
+                Progress.user_id == user_id,
+                Progress.status == CompletionStatus.COMPLETED,
+                Progress.score.isnot(None)
+            )
+            .order_by(Progress.last_interaction.desc().nulls_last(), Progress.id)
+            .limit(5)
+            .all()
+        )
+        if not recent_completions:
+            return None
+        
+        # Use the most recently completed content with high score as seed
+        for content_id, score in recent_completions:
+            if score >= 80:
+                return content_id
+        return recent_completions[0].content_id
+    
+    def _select_seed_content(self, progress: List[Progress]) -> Optional[int]:
+        """
+        Pick the content to base personalized recommendations on.
+        
+        Args:
+            progress: User's progress records
+            
+        Returns:
+            ID of the seed content, or None if the user has no scored completions
+        """
         # Get recently completed content
         completed_progress = [p for p in progress if p.status == "completed" and p.score is not None]
         if not completed_progress:
-            return self._recommend_for_new_user(user, limit)
+            return None
         
-        # Sort by last interaction (most recent first)
-        completed_progress.sort(key=lambda p: p.last_interaction or 0, reverse=True)
+        # Sort by last interaction (most recent first, never-interacted last)
+        completed_progress.sort(
+            key=lambda p: (p.last_interaction is not None, p.last_interaction or datetime.min),
+            reverse=True
+        )
         
         # Use the most recently completed content with high score as seed
         high_score_progress = [p for p in completed_progress[:5] if p.score and p.score >= 80]
         
         if high_score_progress:
-            seed_content_id = high_score_progress[0].content_id
-        else:
-            seed_content_id = completed_progress[0].content_id
-        
-        # Get similar content to the seed
-        similar_content = self.get_similar_content(seed_content_id, limit=limit*2)
+            return high_score_progress[0].content_id
+        return completed_progress[0].content_id
+    
+    def _merge_recommendations(
+        self,
+        user: User,
+        completed_ids: Set[int],
+        similar_content: List[Dict],
+        limit: int,
+        progress: Optional[List[Progress]] = None
+    ) -> List[Dict]:
+        """
+        Combine seed-similar and topic-based content into the final recommendations.
         
-        # Filter out already completed content
-        completed_ids = {p.content_id for p in progress}
-        recommendations = [
-            item for item in similar_content if item["id"] not in completed_ids
-        ]
+        Args:
+            user: User to recommend for
+            completed_ids: IDs of content the user already has progress on
+            similar_content: Content similar to the user's seed content
+            limit: Maximum number of recommendations to return
+            progress: User's progress records with content loaded; fetched only
+                if topic-based recommendations are needed and none are given
+            
+        Returns:
+            List of recommended content items
+        """
+        # Filter out already completed content, keyed by ID in recommendation order
+        recs_by_id: Dict[int, Dict] = {
+            item["id"]: item for item in similar_content if item["id"] not in completed_ids
+        }
         
         # If we don't have enough recommendations, add some from topic-based recommendations
-        if len(recommendations) < limit:
+        if len(recs_by_id) < limit:
+            if progress is None:
+                progress = (
+                    self.db.query(Progress)
+                    .options(*progress_with_content())
+                    .filter_by(user_id=user.id)
+                    .all()
+                )
             topic_recs = self._get_topic_based_recommendations(user, progress, limit*2)
             for rec in topic_recs:
-                if rec["id"] not in completed_ids and not any(r["id"] == rec["id"] for r in recommendations):
-                    recommendations.append(rec)
-                    if len(recommendations) >= limit:
+                if rec["id"] not in completed_ids:
+                    recs_by_id.setdefault(rec["id"], rec)
+                    if len(recs_by_id) >= limit:
                         break
         
-        return recommendations[:limit]
+        return list(recs_by_id.values())[:limit]
     
     def _recommend_for_new_user(self, user: User, limit: int = 5) -> List[Dict]:
         """Generate recommendations for a new user with no history."""
@@ -286,32 +612,27 @@ class ContentRecommender:
     ) -> List[Dict]:
         """Generate recommendations based on topics the user has engaged with."""
         # Count interaction with each topic
-        topic_interactions = {}
+        topic_interactions: Dict[int, TopicStats] = {}
         
         for p in progress:
             if not p.content:
                 continue
                 
             topic_id = p.content.topic_id
-            if topic_id not in topic_interactions:
-                topic_interactions[topic_id] = {
-                    "count": 0,
-                    "score_sum": 0,
-                    "score_count": 0
-                }
+            stats = topic_interactions.get(topic_id)
+            if stats is None:
+                stats = topic_interactions[topic_id] = TopicStats()
             
-            topic_interactions[topic_id]["count"] += 1
+            stats.count += 1
             
             if p.score is not None:
-                topic_interactions[topic_id]["score_sum"] += p.score
-                topic_interactions[topic_id]["score_count"] += 1
+                stats.score_sum += p.score
+                stats.score_count += 1
         
         # Calculate average score for each topic
-        for topic_id, data in topic_interactions.items():
-            if data["score_count"] > 0:
-                data["avg_score"] = data["score_sum"] / data["score_count"]
-            else:
-                data["avg_score"] = None
+        for stats in topic_interactions.values():
+            if stats.score_count > 0:
+                stats.avg_score = stats.score_sum / stats.score_count
         
         # Find content from most engaged topics that hasn't been completed
         completed_ids = {p.content_id for p in progress}
@@ -320,30 +641,40 @@ class ContentRecommender:
         # Sort topics by engagement (most engaged first)
         sorted_topics = sorted(
             topic_interactions.items(), 
-            key=lambda x: x[1]["count"], 
+            key=lambda x: x[1].count, 
             reverse=True
         )
         
+        if not sorted_topics:
+            return recommendations
+        
+        # Determine appropriate difficulty for each topic based on average score
+        pairs = []
         for topic_id, data in sorted_topics:
-            # Determine appropriate difficulty based on average score
-            if data["avg_score"] is None or data["avg_score"] < 60:
+            if data.avg_score is None or data.avg_score < 60:
                 difficulty = "beginner"
-            elif data["avg_score"] < 75:
+            elif data.avg_score < 75:
                 difficulty = "easy"
-            elif data["avg_score"] < 90:
+            elif data.avg_score < 90:
                 difficulty = "medium"
             else:
                 difficulty = "hard"
-            
-            # Find content of appropriate difficulty
-            topic_content = self.db.query(CurriculumContent).filter(
-                CurriculumContent.topic_id == topic_id,
-                CurriculumContent.id.notin_(completed_ids),
-                CurriculumContent.difficulty_level == difficulty
-            ).all()
-            
-            for content in topic_content:
-                relevance = 75.0 + (data["count"] / max(topic_interactions.values(), key=lambda x: x["count"])["count"]) * 15.0
+            pairs.append((topic_id, difficulty))
+        
+        # Find content of appropriate difficulty for all topics in one query
+        content_by_topic = {topic_id: [] for topic_id, _ in pairs}
+        for content in self.db.query(CurriculumContent).filter(
+            tuple_(CurriculumContent.topic_id, CurriculumContent.difficulty_level).in_(pairs),
+            CurriculumContent.id.notin_(completed_ids)
+        ).order_by(CurriculumContent.id):
+            content_by_topic[content.topic_id].append(content)
+        
+        # Engagement of the most engaged topic, used to scale relevance
+        max_count = max((data.count for data in topic_interactions.values()), default=1) or 1
+        
+        for topic_id, data in sorted_topics:
+            for content in content_by_topic[topic_id]:
+                relevance = 75.0 + (data.count / max_count) * 15.0
                 
                 recommendations.append({
                     "id": content.id,
@@ -363,18 +694,299 @@ class ContentRecommender:
         return recommendations
 
 
+def _get_shared_index(index_path: Path, mapping_path: Path) -> Tuple:
+    """
+    Return the process-wide index entry, loading it if missing or stale.
+    
+    Args:
+        index_path: Path of the FAISS index file
+        mapping_path: Path of the index position to content ID mapping
+        
+    Returns:
+        (signature, index, id_mapping, id_to_idx, idx_to_id)
+    """
+    global _INDEX_CACHE
+    
+    signature = (str(index_path), index_path.stat().st_mtime_ns, mapping_path.stat().st_mtime_ns)
+    cached = _INDEX_CACHE
+    if cached is not None and cached[0] == signature:
+        return cached
+    
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE
+        if cached is not None and cached[0] == signature:
+            return cached
+        
+        # Flat index: read_index copies it into memory, one copy per process
+        index = faiss.read_index(str(index_path))
+        with open(mapping_path, 'r') as f:
+            id_mapping = json.load(f)
+        # Index both directions once so per-query lookups are O(1)
+        idx_to_id = {int(idx): int(c_id) for idx, c_id in id_mapping.items()}
+        id_to_idx = {c_id: idx for idx, c_id in idx_to_id.items()}
+        
+        _INDEX_CACHE = (signature, index, id_mapping, id_to_idx, idx_to_id)
+        logger.info("Successfully loaded vector index and mapping")
+        return _INDEX_CACHE
+
+
+def _similar_result(content: CurriculumContent, similarity: float) -> Dict:
+    """Format one content item as a similar content result."""
+    return {
+        "id": content.id,
+        "title": content.title,
+        "similarity_score": round(float(similarity), 2),
+        "content_type": content.content_type.value,
+        "difficulty_level": content.difficulty_level.value
+    }
+
+
+def _copy_results(results: List[Dict]) -> List[Dict]:
+    """Copy a result list so cached entries never share dicts with callers."""
+    return [dict(item) for item in results]
+
+
+def invalidate_content() -> None:
+    """
+    Drop all cached recommendation results.
+    
+    Results embed details of neighbouring content, so a change to any
+    content item can affect entries keyed on other items.
+    """
+    _similar_cache.clear()
+    _personalized_cache.clear()
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop cached personalized recommendations for a user."""
+    _personalized_cache.pop(user_id)
+
+
+def _on_content_change(mapper, connection, target) -> None:
+    invalidate_content()
+
+
+def _on_progress_change(mapper, connection, target) -> None:
+    invalidate_user(target.user_id)
+
+
+def _on_user_change(mapper, connection, target) -> None:
+    invalidate_user(target.id)
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(CurriculumContent, _event, _on_content_change)
+    event.listen(Progress, _event, _on_progress_change)
+event.listen(User, "after_update", _on_user_change)
+
+
 # sangram_tutor/ml/learning_style_detector.py
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
+from sangram_tutor.models.curriculum import ContentType, CurriculumContent
 from sangram_tutor.models.progress import Progress
 from sangram_tutor.models.user import User, LearningStyle
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; reductions fall back to NumPy
+    njit = None
+    prange = range
+
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming a user's progress
+PROGRESS_YIELD_PER = 1000
+
+# Records summed per parallel chunk by the content-type reduction
+REDUCE_CHUNK_SIZE = 4096
+
+# Position of each content type in content-type-id arrays
+CONTENT_TYPES = list(ContentType)
+CONTENT_TYPE_INDEX = {content_type: i for i, content_type in enumerate(CONTENT_TYPES)}
+
+# Order of learning styles in affinity arrays
+_STYLE_ORDER = [style.value for style in LearningStyle]
+_STYLE_INDEX = {style: i for i, style in enumerate(_STYLE_ORDER)}
+_NO_STYLES = np.empty(0, dtype=np.intp)
+
+# Affinity positions of the learning styles indicated by strong or weak
+# performance on each content type
+_CT_PERF_MAP = {
+    content_type: np.array([_STYLE_INDEX[style.value] for style in styles], dtype=np.intp)
+    for content_type, styles in {
+        "concept": [LearningStyle.READING_WRITING, LearningStyle.LOGICAL],
+        "example": [LearningStyle.VISUAL, LearningStyle.LOGICAL],
+        "exercise": [LearningStyle.KINESTHETIC, LearningStyle.READING_WRITING],
+        "game": [LearningStyle.KINESTHETIC, LearningStyle.VISUAL, LearningStyle.SOCIAL],
+        "quiz": [LearningStyle.LOGICAL, LearningStyle.SOLITARY],
+        "assessment": [LearningStyle.LOGICAL, LearningStyle.SOLITARY]
+    }.items()
+}
+
+# Affinity positions of the learning styles indicated by high or low
+# engagement with each content type
+_CT_ENG_MAP = {
+    content_type: np.array([_STYLE_INDEX[style.value] for style in styles], dtype=np.intp)
+    for content_type, styles in {
+        "concept": [LearningStyle.AUDITORY, LearningStyle.READING_WRITING],
+        "example": [LearningStyle.VISUAL, LearningStyle.AUDITORY],
+        "exercise": [LearningStyle.KINESTHETIC, LearningStyle.LOGICAL],
+        "game": [LearningStyle.KINESTHETIC, LearningStyle.SOCIAL],
+        "quiz": [LearningStyle.READING_WRITING, LearningStyle.SOLITARY],
+        "assessment": [LearningStyle.LOGICAL, LearningStyle.SOLITARY]
+    }.items()
+}
+
+
+def _reduce_by_type_kernel(
+    type_ids: np.ndarray,
+    scores: np.ndarray,
+    times: np.ndarray,
+    attempts: np.ndarray,
+    n_types: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sum scores, time spent and attempts per content type.
+    
+    Records are split into chunks reduced in parallel, each into its own row
+    of partial sums, so every record is read once and no accumulator is
+    shared between threads. The partial rows are then added up.
+    
+    Args:
+        type_ids: Per-record content type code, -1 for records to skip
+        scores: Per-record score
+        times: Per-record time spent, 0 if missing
+        attempts: Per-record attempts, 0 if missing
+        n_types: Number of content type codes
+        
+    Returns:
+        (score_sum, score_count, time_sum, time_count, attempt_sum,
+        attempt_count), each indexed by content type code
+    """
+    n = type_ids.shape[0]
+    n_chunks = (n + REDUCE_CHUNK_SIZE - 1) // REDUCE_CHUNK_SIZE
+    score_sum = np.zeros((n_chunks, n_types))
+    score_count = np.zeros((n_chunks, n_types), dtype=np.int64)
+    time_sum = np.zeros((n_chunks, n_types))
+    time_count = np.zeros((n_chunks, n_types), dtype=np.int64)
+    attempt_sum = np.zeros((n_chunks, n_types))
+    attempt_count = np.zeros((n_chunks, n_types), dtype=np.int64)
+    
+    for c in prange(n_chunks):
+        for i in range(c * REDUCE_CHUNK_SIZE, min(n, (c + 1) * REDUCE_CHUNK_SIZE)):
+            t = type_ids[i]
+            if t < 0:
+                continue
+            score_sum[c, t] += scores[i]
+            score_count[c, t] += 1
+            if times[i] != 0:
+                time_sum[c, t] += times[i]
+                time_count[c, t] += 1
+            if attempts[i] != 0:
+                attempt_sum[c, t] += attempts[i]
+                attempt_count[c, t] += 1
+    
+    return (
+        score_sum.sum(axis=0), score_count.sum(axis=0),
+        time_sum.sum(axis=0), time_count.sum(axis=0),
+        attempt_sum.sum(axis=0), attempt_count.sum(axis=0),
+    )
+
+
+def _reduce_by_type_vectorized(
+    type_ids: np.ndarray,
+    scores: np.ndarray,
+    times: np.ndarray,
+    attempts: np.ndarray,
+    n_types: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy equivalent of _reduce_by_type_kernel for deployments without Numba."""
+    valid = type_ids >= 0
+    type_ids, scores, times, attempts = type_ids[valid], scores[valid], times[valid], attempts[valid]
+    has_time = times != 0
+    has_attempts = attempts != 0
+    
+    return (
+        np.bincount(type_ids, weights=scores, minlength=n_types),
+        np.bincount(type_ids, minlength=n_types),
+        np.bincount(type_ids[has_time], weights=times[has_time], minlength=n_types),
+        np.bincount(type_ids[has_time], minlength=n_types),
+        np.bincount(type_ids[has_attempts], weights=attempts[has_attempts], minlength=n_types),
+        np.bincount(type_ids[has_attempts], minlength=n_types),
+    )
+
+
+# Compiled once and cached on disk across processes when Numba is installed
+if njit is not None:
+    _reduce_by_type = njit(parallel=True, cache=True)(_reduce_by_type_kernel)
+else:
+    _reduce_by_type = _reduce_by_type_vectorized
+
+
+def _grow(buffer: np.ndarray, capacity: int) -> np.ndarray:
+    """Copy a buffer into a larger uninitialized one of the same dtype."""
+    grown = np.empty(capacity, dtype=buffer.dtype)
+    grown[:len(buffer)] = buffer
+    return grown
+
+
+def _extract_progress_soa(
+    rows: Iterable[Row]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Copy the fields the detector reads into one array per field.
+    
+    Rows are consumed in a single pass into buffers that double in size
+    when full, so a streamed result is never held as a list of rows.
+    
+    Args:
+        rows: (content_type, score, time_spent_seconds, attempts,
+            engagement_score) rows, content_type None for missing content
+        
+    Returns:
+        (type_codes, scores, times, attempts, engagement, has_score). Records
+        without content get type code -1; missing numeric values are 0.
+    """
+    capacity = PROGRESS_YIELD_PER
+    type_codes = np.empty(capacity, dtype=np.int64)
+    scores = np.empty(capacity)
+    times = np.empty(capacity)
+    attempts = np.empty(capacity)
+    engagement = np.empty(capacity)
+    has_score = np.empty(capacity, dtype=bool)
+    
+    n = 0
+    for content_type, score, time_spent, attempt_count, engagement_score in rows:
+        if n == capacity:
+            capacity *= 2
+            type_codes, scores, times, attempts, engagement, has_score = (
+                _grow(buffer, capacity)
+                for buffer in (type_codes, scores, times, attempts, engagement, has_score)
+            )
+        
+        type_codes[n] = CONTENT_TYPE_INDEX.get(content_type, -1)
+        scores[n] = score if score is not None else 0
+        has_score[n] = score is not None
+        times[n] = time_spent or 0
+        attempts[n] = attempt_count or 0
+        engagement[n] = engagement_score or 0
+        n += 1
+    
+    return type_codes[:n], scores[:n], times[:n], attempts[:n], engagement[:n], has_score[:n]
+
+
+def _first_seen_types(type_codes: np.ndarray) -> List[int]:
+    """List the distinct non-negative type codes in order of first appearance."""
+    codes, first = np.unique(type_codes[type_codes >= 0], return_index=True)
+    return codes[np.argsort(first)].tolist()
+
+
 class LearningStyleDetector:
     """
     Detects and predicts user learning styles based on interaction patterns.
@@ -399,110 +1011,95 @@ class LearningStyleDetector:
             logger.error(f"User with ID {user_id} not found")
             return {}
         
-        # Get user's progress data
-        progress_records = self.db.query(Progress).filter_by(user_id=user_id).all()
+        # Stream the user's progress as plain column rows and extract the
+        # fields both analyses read in one pass
+        rows = self.db.execute(
+            select(
+                CurriculumContent.content_type,
+                Progress.score,
+                Progress.time_spent_seconds,
+                Progress.attempts,
+                Progress.engagement_score,
+            )
+            .outerjoin(CurriculumContent, Progress.content_id == CurriculumContent.id)
+            .where(Progress.user_id == user_id)
+            .execution_options(yield_per=PROGRESS_YIELD_PER)
+        )
+        soa = _extract_progress_soa(rows)
         
-        if not progress_records:
+        if not soa[0].size:
             # Not enough data - return balanced affinities
             return {style.value: 0.5 for style in LearningStyle}
         
-        # Initialize learning style affinities
-        style_affinities = {style.value: 0.5 for style in LearningStyle}
+        # Initialize learning style affinities, ordered as _STYLE_ORDER
+        style_affinities = np.full(len(_STYLE_ORDER), 0.5)
         
         # Analyze performance by content type
-        content_type_performance = self._analyze_content_type_performance(progress_records)
+        content_type_performance = self._analyze_content_type_performance(soa)
         
         # Update affinities based on performance patterns
         if content_type_performance:
             self._update_affinities_from_performance(style_affinities, content_type_performance)
         
         # Analyze engagement patterns
-        engagement_patterns = self._analyze_engagement_patterns(progress_records)
+        engagement_patterns = self._analyze_engagement_patterns(soa)
         
         # Update affinities based on engagement patterns
         if engagement_patterns:
             self._update_affinities_from_engagement(style_affinities, engagement_patterns)
         
         # Normalize affinities to ensure they sum to a consistent value
-        total = sum(style_affinities.values())
+        total = style_affinities.sum()
         if total > 0:
-            for style in style_affinities:
-                style_affinities[style] = round(style_affinities[style] / total * len(style_affinities), 2)
+            normalized = style_affinities / total * style_affinities.size
+            return dict(zip(_STYLE_ORDER, (round(value, 2) for value in normalized.tolist())))
         
-        return style_affinities
+        return dict(zip(_STYLE_ORDER, style_affinities.tolist()))
     
-    def _analyze_content_type_performance(self, progress_records: List[Progress]) -> Dict:
+    def _analyze_content_type_performance(self, soa: Tuple[np.ndarray, ...]) -> Dict:
         """Analyze user performance by content type."""
-        type_performance = {}
+        type_codes, scores, times, attempts, _, has_score = soa
         
-        for progress in progress_records:
-            if not progress.content or progress.score is None:
-                continue
-                
-            content_type = progress.content.content_type.value
-            if content_type not in type_performance:
-                type_performance[content_type] = {
-                    "scores": [],
-                    "time_spent": [],
-                    "attempts": []
-                }
-            
-            type_performance[content_type]["scores"].append(progress.score)
-            
-            if progress.time_spent_seconds:
-                type_performance[content_type]["time_spent"].append(progress.time_spent_seconds)
-                
-            if progress.attempts:
-                type_performance[content_type]["attempts"].append(progress.attempts)
+        # Records without content or score are moved to type -1 and skipped
+        type_ids = np.where(has_score, type_codes, -1)
+        
+        score_sum, score_count, time_sum, time_count, attempt_sum, attempt_count = _reduce_by_type(
+            type_ids, scores, times, attempts, len(CONTENT_TYPES)
+        )
         
-        # Calculate averages
+        # Calculate averages, keeping content types in first-seen order
         result = {}
-        for content_type, data in type_performance.items():
-            result[content_type] = {
-                "avg_score": sum(data["scores"]) / len(data["scores"]) if data["scores"] else None,
-                "avg_time": sum(data["time_spent"]) / len(data["time_spent"]) if data["time_spent"] else None,
-                "avg_attempts": sum(data["attempts"]) / len(data["attempts"]) if data["attempts"] else None,
-                "count": len(data["scores"])
+        for t in _first_seen_types(type_ids):
+            result[CONTENT_TYPES[t].value] = {
+                "avg_score": float(score_sum[t] / score_count[t]),
+                "avg_time": float(time_sum[t] / time_count[t]) if time_count[t] else None,
+                "avg_attempts": float(attempt_sum[t] / attempt_count[t]) if attempt_count[t] else None,
+                "count": int(score_count[t])
             }
         
         return result
     
-    def _analyze_engagement_patterns(self, progress_records: List[Progress]) -> Dict:
+    def _analyze_engagement_patterns(self, soa: Tuple[np.ndarray, ...]) -> Dict:
         """Analyze engagement patterns across different content types."""
-        type_engagement = {}
-        
-        for progress in progress_records:
-            if not progress.content or not progress.engagement_score:
-                continue
-                
-            content_type = progress.content.content_type.value
-            if content_type not in type_engagement:
-                type_engagement[content_type] = []
-                
-            type_engagement[content_type].append(progress.engagement_score)
+        type_codes, _, _, _, engagement, _ = soa
         
-        # Calculate average engagement by content type
-        result = {}
-        for content_type, scores in type_engagement.items():
-            if scores:
-                result[content_type] = sum(scores) / len(scores)
+        # Only records with content and a non-zero engagement score count
+        valid = (type_codes >= 0) & (engagement != 0)
+        type_ids = type_codes[valid]
+        n_types = len(CONTENT_TYPES)
+        engagement_sum = np.bincount(type_ids, weights=engagement[valid], minlength=n_types)
+        engagement_count = np.bincount(type_ids, minlength=n_types)
         
-        return result
+        # Calculate average engagement by content type, in first-seen order
+        return {
+            CONTENT_TYPES[t].value: float(engagement_sum[t] / engagement_count[t])
+            for t in _first_seen_types(type_ids)
+        }
     
     def _update_affinities_from_performance(
-        self, affinities: Dict[str, float], performance: Dict
+        self, affinities: np.ndarray, performance: Dict
     ) -> None:
         """Update learning style affinities based on performance data."""
-        # Mapping of content types to learning styles they indicate
-        content_type_mapping = {
-            "concept": [LearningStyle.READING_WRITING, LearningStyle.LOGICAL],
-            "example": [LearningStyle.VISUAL, LearningStyle.LOGICAL],
-            "exercise": [LearningStyle.KINESTHETIC, LearningStyle.READING_WRITING],
-            "game": [LearningStyle.KINESTHETIC, LearningStyle.VISUAL, LearningStyle.SOCIAL],
-            "quiz": [LearningStyle.LOGICAL, LearningStyle.SOLITARY],
-            "assessment": [LearningStyle.LOGICAL, LearningStyle.SOLITARY]
-        }
-        
         # Find best and worst performing content types
         if not performance:
             return
@@ -521,31 +1118,20 @@ class LearningStyleDetector:
             if score < 70:  # Only consider good performance
                 continue
                 
-            for style in content_type_mapping.get(content_type, []):
-                affinities[style.value] += 0.2
+            affinities[_CT_PERF_MAP.get(content_type, _NO_STYLES)] += 0.2
         
         # Reduce affinities for learning styles associated with low-performing content types
         for content_type, score in sorted_by_score[-2:]:  # Bottom 2 performing types
             if score > 60:  # Only consider poor performance
                 continue
                 
-            for style in content_type_mapping.get(content_type, []):
-                affinities[style.value] = max(0.1, affinities[style.value] - 0.1)
+            styles = _CT_PERF_MAP.get(content_type, _NO_STYLES)
+            affinities[styles] = np.maximum(0.1, affinities[styles] - 0.1)
     
     def _update_affinities_from_engagement(
-        self, affinities: Dict[str, float], engagement: Dict
+        self, affinities: np.ndarray, engagement: Dict
     ) -> None:
         """Update learning style affinities based on engagement data."""
-        # Mapping of content types to learning styles they indicate
-        content_type_mapping = {
-            "concept": [LearningStyle.AUDITORY, LearningStyle.READING_WRITING],
-            "example": [LearningStyle.VISUAL, LearningStyle.AUDITORY],
-            "exercise": [LearningStyle.KINESTHETIC, LearningStyle.LOGICAL],
-            "game": [LearningStyle.KINESTHETIC, LearningStyle.SOCIAL],
-            "quiz": [LearningStyle.READING_WRITING, LearningStyle.SOLITARY],
-            "assessment": [LearningStyle.LOGICAL, LearningStyle.SOLITARY]
-        }
-        
         # Find highest engagement content types
         sorted_by_engagement = sorted(
             engagement.items(),
@@ -561,13 +1147,12 @@ class LearningStyleDetector:
             if engagement_score < 0.6:  # Only consider good engagement
                 continue
                 
-            for style in content_type_mapping.get(content_type, []):
-                affinities[style.value] += 0.15
+            affinities[_CT_ENG_MAP.get(content_type, _NO_STYLES)] += 0.15
         
         # Slightly reduce affinities for learning styles associated with low-engagement content types
         for content_type, engagement_score in sorted_by_engagement[-2:]:  # Bottom 2 engaging types
             if engagement_score > 0.4:  # Only consider poor engagement
                 continue
                 
-            for style in content_type_mapping.get(content_type, []):
-                affinities[style.value] = max(0.1, affinities[style.value] - 0.05)
+            styles = _CT_ENG_MAP.get(content_type, _NO_STYLES)
+            affinities[styles] = np.maximum(0.1, affinities[styles] - 0.05)
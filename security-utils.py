@@ -1,16 +1,34 @@
 # sangram_tutor/utils/security.py
+import hashlib
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
 from typing import Dict, Optional, Union
 
-from jose import jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
 from sangram_tutor.models.user import User
+from sangram_tutor.utils.cache import TTLCache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt only uses the first 72 bytes of a password
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# bcrypt cost factor (2^rounds key-setup iterations). The test configuration
+# sets BCRYPT_ROUNDS=4, since the hashes it creates never protect real accounts.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Opt-in cache of successful verifications, so repeat logins within a minute
+# skip bcrypt. Keys hold a SHA-256 digest of the password, never the password
+# itself. Pointless at minimum cost, so it stays off there.
+AUTH_VERIFY_CACHE = os.getenv("AUTH_VERIFY_CACHE") == "1" and BCRYPT_ROUNDS > 4
+_verified_passwords = TTLCache(maxsize=1024, ttl=60)
+
+# (id, hashed_password) of recently looked-up users keyed by username, so a
+# login only loads the full row once the password has been verified
+_login_lookup = TTLCache(maxsize=2048, ttl=10)
 
 # JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "temporarysecretkeyfordevonly")
@@ -18,14 +36,33 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
 
+def _password_bytes(password: str) -> bytes:
+    """Encode a password the way bcrypt sees it, truncated to 72 bytes."""
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify that a plain password matches a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    if AUTH_VERIFY_CACHE:
+        key = (hashlib.sha256(plain_password.encode("utf-8")).digest(), hashed_password)
+        if _verified_passwords.get(key):
+            return True
+    
+    try:
+        verified = bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+    
+    # Only successes are cached, so a wrong guess always pays the full cost
+    if verified and AUTH_VERIFY_CACHE:
+        _verified_passwords.set(key, True)
+    return verified
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password for storage."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS, prefix=b"2b")).decode("utf-8")
 
 
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
@@ -40,12 +77,33 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     Returns:
         User object if authentication succeeds, None otherwise
     """
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        return None
-    if not verify_password(password, user.hashed_password):
+    credentials = _login_lookup.get(username)
+    if credentials is None:
+        # Only the columns needed to check the password; the full row is
+        # loaded once the password has been verified
+        credentials = db.query(User.id, User.hashed_password).filter(
+            User.username == username
+        ).first()
+        if not credentials:
+            return None
+        credentials = tuple(credentials)
+        _login_lookup.set(username, credentials)
+    
+    user_id, hashed_password = credentials
+    if not verify_password(password, hashed_password):
         return None
-    return user
+    return db.get(User, user_id)
+
+
+def _invalidate_login_lookup(mapper, connection, target) -> None:
+    # Drop the current username and, after a rename, the previous one
+    _login_lookup.pop(target.username)
+    for username in inspect(target).attrs.username.history.deleted:
+        _login_lookup.pop(username)
+
+
+event.listen(User, "after_update", _invalidate_login_lookup)
+event.listen(User, "after_delete", _invalidate_login_lookup)
 
 
 def create_access_token(
@@ -61,33 +119,72 @@ def create_access_token(
     Returns:
         Encoded JWT token
     """
-    to_encode = data.copy()
-    
+    # exp is a NumericDate, so compute the Unix timestamp directly
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+        expire = int(time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    
+    return jwt.encode({**data, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
 
 
 # sangram_tutor/utils/auth.py
+import time
 from typing import Dict, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
+from jwt import InvalidTokenError as JWTError
 from sqlalchemy.orm import Session
 
 from sangram_tutor.db.session import get_db
 from sangram_tutor.models.user import User
-from sangram_tutor.utils.security import SECRET_KEY, ALGORITHM
+from sangram_tutor.utils.cache import TTLCache
+from sangram_tutor.utils.security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
+# Claims every access token must carry, enforced while decoding
+_DECODE_OPTIONS = {"require": ["exp", "sub"], "verify_aud": False}
+
+# Payloads of recently validated tokens as (payload, exp), so repeat requests
+# with the same token skip signature verification until it expires
+_token_cache = TTLCache(maxsize=4096, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def _decode_token(token: str) -> Optional[Dict]:
+    """
+    Decode and validate a JWT, reusing the payload of recently seen tokens.
+    
+    Args:
+        token: Encoded JWT
+        
+    Returns:
+        The token payload, or None if the token is invalid, expired or
+        missing its exp or sub claim
+    """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at > time.time():
+            return payload
+        _token_cache.pop(token)
+    
+    # A JWS compact token is exactly three dot-separated segments; reject
+    # anything else before paying for parsing and HMAC verification
+    if token.count(".") != 2:
+        return None
+    
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options=_DECODE_OPTIONS)
+    except JWTError:
+        return None
+    
+    _token_cache.set(token, (payload, payload["exp"]))
+    return payload
+
 
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
@@ -111,13 +208,10 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+    payload = _decode_token(token)
+    if payload is None:
         raise credentials_exception
+    username: str = payload["sub"]
         
     user = db.query(User).filter(User.username == username).first()
     if user is None:
@@ -143,18 +237,15 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         The authenticated active user
         
     Raises:
-        HTTPException: If user is inactive
+        HTTPException: If user is inactive (raised by get_current_user)
     """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user account"
-        )
     return current_user
 
 
 # sangram_tutor/utils/permissions.py
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Optional
 
 from fastapi import Depends, HTTPException, status
@@ -174,22 +265,22 @@ class Permission(str, Enum):
     ADMIN_ACCESS = "admin_access"
 
 
-# Role-based permissions
-ROLE_PERMISSIONS = {
-    UserRole.STUDENT: [
+# Role-based permissions, frozen so membership checks are hash lookups
+ROLE_PERMISSIONS = MappingProxyType({
+    UserRole.STUDENT: frozenset({
         Permission.READ_CONTENT
-    ],
-    UserRole.PARENT: [
+    }),
+    UserRole.PARENT: frozenset({
         Permission.READ_CONTENT,
         Permission.VIEW_ANALYTICS
-    ],
-    UserRole.TEACHER: [
+    }),
+    UserRole.TEACHER: frozenset({
         Permission.READ_CONTENT,
         Permission.CREATE_CONTENT,
         Permission.EDIT_CONTENT,
         Permission.VIEW_ANALYTICS
-    ],
-    UserRole.ADMIN: [
+    }),
+    UserRole.ADMIN: frozenset({
         Permission.READ_CONTENT,
         Permission.CREATE_CONTENT,
         Permission.EDIT_CONTENT,
@@ -197,8 +288,8 @@ ROLE_PERMISSIONS = {
         Permission.VIEW_ANALYTICS,
         Permission.MANAGE_USERS,
         Permission.ADMIN_ACCESS
-    ]
-}
+    })
+})
 
 
 def has_permission(permission: Permission, user: User) -> bool:
@@ -215,14 +306,18 @@ def has_permission(permission: Permission, user: User) -> bool:
     if not user:
         return False
         
-    user_permissions = ROLE_PERMISSIONS.get(user.role, [])
+    user_permissions = ROLE_PERMISSIONS.get(user.role, frozenset())
     return permission in user_permissions
 
 
+@lru_cache(maxsize=None)
 def require_permission(permission: Permission):
     """
     Dependency function factory to require a specific permission.
     
+    Memoized, so every route requiring the same permission shares one
+    dependency function.
+    
     Args:
         permission: The required permission
         